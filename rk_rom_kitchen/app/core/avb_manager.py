@@ -11,7 +11,7 @@ import time
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, Dict, List, Tuple
 from threading import Event
 
 from .task_defs import TaskResult
@@ -42,21 +42,24 @@ FSTAB_PATTERNS = {
 }
 
 
+def vbmeta_search_dirs(project: Project) -> List[Path]:
+    """Thư mục tìm vbmeta*.img. Priority: out/Image/update/partitions > in/"""
+    return [
+        project.out_image_dir / "update" / "partitions",
+        project.in_dir,
+    ]
+
+
 def scan_vbmeta_targets(project: Project) -> List[Path]:
     """
     Scanner tìm vbmeta targets dựa trên slot_mode.
     Priority: out/Image/update/partitions > in/
     Returns: List output/target paths (để patch).
     """
-    input_dirs = [
-        project.out_image_dir / "update" / "partitions",
-        project.in_dir,
-    ]
-    
     # 1. Collect all candidates
     candidates = {}  # filename -> Path (full path found)
     
-    for d in input_dirs:
+    for d in vbmeta_search_dirs(project):
         if not d.exists():
             continue
         # Scan vbmeta*.img
@@ -67,8 +70,14 @@ def scan_vbmeta_targets(project: Project) -> List[Path]:
                 candidates[p.name] = p
                 
     # 2. Filter by slot_mode
-    slot_mode = getattr(project.config, "slot_mode", "auto")
-    final_files = []
+    return select_vbmeta_by_slot(candidates, getattr(project.config, "slot_mode", "auto"))
+
+
+def select_vbmeta_by_slot(candidates: Dict[str, Path], slot_mode: str) -> List[Path]:
+    """
+    Lọc vbmeta candidates (filename -> path, theo thứ tự ưu tiên) theo slot_mode:
+    auto / A / B / both
+    """
     
     # helper: group by base (system, vendor, etc) ignoring _a/_b/suffix
     # But vbmeta naming is weird: vbmeta.img, vbmeta_system.img, vbmeta_a.img
@@ -145,19 +154,22 @@ def scan_vbmeta_targets(project: Project) -> List[Path]:
     return results
 
 
-def find_fstab_files(project: Project) -> List[Path]:
-    """Tìm fstab files theo ưu tiên"""
-    found = []
-    
+def fstab_search_configs(project: Project) -> List[Tuple[Path, List[str]]]:
+    """(thư mục etc, glob patterns) để tìm fstab, theo thứ tự ưu tiên"""
     # Priority: vendor_a > system_a > product_a
-    search_configs = [
+    return [
         (project.source_dir / "vendor_a" / "etc", ["fstab.*", "*fstab*"]),
         (project.source_dir / "system_a" / "etc", ["fstab.*", "*fstab*"]),
         (project.source_dir / "system_a" / "vendor" / "etc", ["fstab.*"]),
         (project.source_dir / "product_a" / "etc", ["fstab.*"]),
     ]
+
+
+def find_fstab_files(project: Project) -> List[Path]:
+    """Tìm fstab files theo ưu tiên"""
+    found = []
     
-    for search_dir, patterns in search_configs:
+    for search_dir, patterns in fstab_search_configs(project):
         if not search_dir.exists():
             continue
         for pattern in patterns:
@@ -24,12 +24,16 @@ BOOT_IMAGE_NAMES = [
 ]
 
 
+def boot_search_dirs(project: Project) -> List[Path]:
+    """Thư mục tìm boot images"""
+    return [project.in_dir, project.out_dir, project.image_dir]
+
+
 def find_boot_images(project: Project) -> List[Path]:
     """Tìm boot images trong project"""
     found = []
-    search_dirs = [project.in_dir, project.out_dir, project.image_dir]
     
-    for search_dir in search_dirs:
+    for search_dir in boot_search_dirs(project):
         if not search_dir.exists():
             continue
         for name in BOOT_IMAGE_NAMES:
@@ -5,7 +5,6 @@ Logs unhandled exceptions to file and displays user-friendly dialog.
 import sys
 import threading
 import datetime
-import traceback
 from pathlib import Path
 
 # Adjust paths relative to this file
@@ -15,29 +14,40 @@ APP_DIR = Path(__file__).resolve().parent.parent
 PROJECT_ROOT = APP_DIR.parent
 LOG_DIR = PROJECT_ROOT / "logs"
 
+_SEP = '-' * 40
+_REPORT_HEADER = "RK ROM Kitchen Crash Report\nTime: {ts}\nThread: {thread}\n" + _SEP + "\n"
+
+# Re-entrancy guard: handler crash lại (vd Qt dialog lỗi) -> fallback hook mặc định
+_in_handler = threading.local()
+# Serialize ghi log khi nhiều thread crash cùng lúc
+_log_write_lock = threading.Lock()
+
 def setup_global_exception_hooks(log_to_file: bool = True):
     """Install global exception hooks for sys and threading"""
     
     if log_to_file:
-        if not LOG_DIR.exists():
-            LOG_DIR.mkdir(parents=True, exist_ok=True)
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
 
     def handle_exception(exc_type, exc_value, exc_traceback):
-        if issubclass(exc_type, KeyboardInterrupt):
+        if issubclass(exc_type, KeyboardInterrupt) or getattr(_in_handler, 'active', False):
             sys.__excepthook__(exc_type, exc_value, exc_traceback)
             return
 
-        log_crash(exc_type, exc_value, exc_traceback, thread_name="MainThread")
-        
-        # Try to show UI dialog if possible
+        _in_handler.active = True
         try:
-            from PyQt5.QtWidgets import QApplication, QMessageBox
-            app = QApplication.instance()
-            if app:
-                msg = f"An unexpected error occurred:\n{exc_value}\n\nA crash log has been saved to logs/."
-                QMessageBox.critical(None, "Critical Error", msg)
-        except:
-            pass
+            log_crash(exc_type, exc_value, exc_traceback, thread_name="MainThread")
+            
+            # Try to show UI dialog if possible
+            try:
+                from PyQt5.QtWidgets import QApplication, QMessageBox
+                app = QApplication.instance()
+                if app:
+                    msg = f"An unexpected error occurred:\n{exc_value}\n\nA crash log has been saved to logs/."
+                    QMessageBox.critical(None, "Critical Error", msg)
+            except:
+                pass
+        finally:
+            _in_handler.active = False
             
     def handle_thread_exception(args):
         log_crash(args.exc_type, args.exc_value, args.exc_traceback, thread_name=threading.current_thread().name)
@@ -46,19 +56,22 @@ def setup_global_exception_hooks(log_to_file: bool = True):
     threading.excepthook = handle_thread_exception
 
 def log_crash(exc_type, exc_value, tb, thread_name="Unknown"):
+    import traceback
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = LOG_DIR / f"CRASH_{timestamp}.log"
     
+    # Build report trong memory -> một lần write duy nhất
+    tb_str = "".join(traceback.format_exception(exc_type, exc_value, tb))
+    report = _format_report(timestamp, thread_name, tb_str)
+    
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"RK ROM Kitchen Crash Report\n")
-            f.write(f"Time: {timestamp}\n")
-            f.write(f"Thread: {thread_name}\n")
-            f.write(f"{'-'*40}\n")
-            f.write("".join(traceback.format_exception(exc_type, exc_value, tb)))
-            f.write(f"{'-'*40}\n")
+        with _log_write_lock, open(filename, "w", encoding="utf-8") as f:
+            f.write(report)
         print(f"[CRASH] Log saved to: {filename}", file=sys.stderr)
     except Exception as e:
         print(f"[CRASH] Failed to write crash log: {e}", file=sys.stderr)
-        traceback.print_exception(exc_type, exc_value, tb)
+        print(tb_str, file=sys.stderr, end="")
+
+def _format_report(timestamp: str, thread_name: str, tb_str: str) -> str:
+    return "".join((_REPORT_HEADER.format(ts=timestamp, thread=thread_name), tb_str, _SEP, "\n"))
 
@@ -0,0 +1,101 @@
+"""
+Project Scan - Một lượt os.scandir cho vbmeta / fstab / boot images
+Các finder riêng (scan_vbmeta_targets, find_fstab_files, find_boot_images) mỗi cái
+glob/exists lại cùng thư mục (in/ dùng chung cho vbmeta + boot). Ở đây mỗi thư mục
+chỉ scandir một lần (không đệ quy, giống các finder), rồi phân loại theo tên.
+"""
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .task_defs import TaskResult
+from .project_store import Project
+from .avb_manager import vbmeta_search_dirs, select_vbmeta_by_slot, fstab_search_configs
+from .boot_manager import BOOT_IMAGE_NAMES, boot_search_dirs
+from .utils import dir_mtimes
+
+
+# Giống Path.exists(): không phân biệt hoa thường trên Windows
+_BOOT_NAMES = frozenset(os.path.normcase(n) for n in BOOT_IMAGE_NAMES)
+
+# project path -> (stamp, result); stamp = mtime các thư mục đã scandir + slot_mode
+_scan_cache: Dict[str, Tuple[tuple, Dict[str, List[Path]]]] = {}
+
+
+def _scan_dirs(project: Project) -> List[Path]:
+    """Mọi thư mục mà scan_project đọc, không trùng, giữ thứ tự"""
+    dirs = vbmeta_search_dirs(project)
+    dirs += [d for d, _ in fstab_search_configs(project)]
+    dirs += boot_search_dirs(project)
+    dirs.append(project.out_dir / "boot_unpacked")
+    return list(dict.fromkeys(dirs))
+
+
+def _list_dir(folder: Path) -> List[os.DirEntry]:
+    try:
+        with os.scandir(folder) as it:
+            return list(it)
+    except OSError:
+        return []
+
+
+def scan_project(project: Project) -> Dict[str, List[Path]]:
+    """
+    Scan project một lượt.
+    Returns: {"vbmeta": [...], "fstab": [...], "boot": [...], "boot_unpacked": [...]}
+    cùng kết quả với các finder tương ứng. Cache theo mtime thư mục, nên gọi lại
+    khi không có gì thay đổi chỉ tốn vài stat().
+    """
+    dirs = _scan_dirs(project)
+    stamp = dir_mtimes(dirs) + (getattr(project.config, "slot_mode", "auto"),)
+    key = str(project.path)
+    hit = _scan_cache.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+
+    listings = {d: _list_dir(d) for d in dirs}
+
+    # vbmeta: filename đầu tiên theo thứ tự ưu tiên thư mục
+    candidates: Dict[str, Path] = {}
+    for d in vbmeta_search_dirs(project):
+        for entry in listings[d]:
+            name = entry.name
+            if (fnmatch(name, "vbmeta*.img") and name != "vbmeta_disabled.img"
+                    and name not in candidates):
+                candidates[name] = Path(entry.path)
+
+    # fstab: theo thư mục rồi theo pattern, bỏ .bak
+    fstab: List[Path] = []
+    seen = set()
+    for d, patterns in fstab_search_configs(project):
+        entries = [e for e in listings[d] if not e.name.endswith(".bak")]
+        for pattern in patterns:
+            for entry in entries:
+                if entry.path not in seen and fnmatch(entry.name, pattern) and entry.is_file():
+                    seen.add(entry.path)
+                    fstab.append(Path(entry.path))
+
+    # boot: file/folder trùng tên BOOT_IMAGE_NAMES
+    boot = list(dict.fromkeys(
+        Path(e.path)
+        for d in boot_search_dirs(project)
+        for e in listings[d]
+        if os.path.normcase(e.name) in _BOOT_NAMES
+    ))
+
+    unpacked = [Path(e.path) for e in listings[project.out_dir / "boot_unpacked"] if e.is_dir()]
+
+    result = {
+        "vbmeta": select_vbmeta_by_slot(candidates, stamp[-1]),
+        "fstab": fstab,
+        "boot": boot,
+        "boot_unpacked": unpacked,
+    }
+    _scan_cache[key] = (stamp, result)
+    return result
+
+
+def scan_project_task(project: Project) -> TaskResult:
+    """scan_project cho TaskManager.run_background: kết quả nằm trong result.data"""
+    return TaskResult.success("Scan xong", **scan_project(project))
@@ -3,13 +3,15 @@ Settings Store - Load/save settings từ %APPDATA%\rk_kitchen\settings.json
 """
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 from dataclasses import dataclass, field, asdict
 
 
+@lru_cache(maxsize=1)
 def get_appdata_dir() -> Path:
-    """Lấy đường dẫn %APPDATA%\\rk_kitchen"""
+    """Lấy đường dẫn %APPDATA%\\rk_kitchen (cache, env không đổi trong runtime)"""
     appdata = os.environ.get('APPDATA', os.path.expanduser('~'))
     return Path(appdata) / 'rk_kitchen'
 
@@ -30,6 +32,7 @@ class Settings:
     theme: str = "dark"
     log_level: str = "INFO"
     auto_scroll_log: bool = True
+    tool_check_cache: dict = field(default_factory=dict)  # normcase path -> [mtime_ns, size, version]
     
     def to_dict(self) -> dict:
         return asdict(self)
@@ -38,7 +41,7 @@ class Settings:
     def from_dict(cls, data: dict) -> 'Settings':
         # Chỉ lấy các keys hợp lệ
         valid_keys = {'language', 'workspace_root', 'tool_dir', 'recent_projects', 'max_recent', 
-                      'theme', 'log_level', 'auto_scroll_log'}
+                      'theme', 'log_level', 'auto_scroll_log', 'tool_check_cache'}
         filtered = {k: v for k, v in data.items() if k in valid_keys}
         return cls(**filtered)
 
@@ -3,6 +3,9 @@ Slot Utils - Helpers for A/B partition slot suffix handling
 Tránh unsafe replace('_a','').replace('_b','') có thể cắt nhầm tên partition
 """
 
+# Slot suffixes, dùng làm tuple cho str.endswith
+SLOT_SUFFIXES = ("_a", "_b")
+
 
 def strip_slot_suffix(name: str) -> str:
     """
@@ -14,7 +17,7 @@ def strip_slot_suffix(name: str) -> str:
         "data_backup" -> "data_backup" (không cắt vì không phải suffix)
         "camera" -> "camera"
     """
-    if name.endswith("_a") or name.endswith("_b"):
+    if name.endswith(SLOT_SUFFIXES):
         return name[:-2]
     return name
 
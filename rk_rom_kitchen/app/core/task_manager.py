@@ -106,6 +106,7 @@ if HAS_QT:
             self._pool = QThreadPool.globalInstance()
             self._pool.setMaxThreadCount(4)
             self._workers: dict[str, Worker] = {}
+            self._background: set = set()  # Giữ ref Worker của run_background
             self._task_counter = 0
         
         def _generate_task_id(self) -> str:
@@ -175,6 +176,25 @@ if HAS_QT:
             
             return task_id
         
+        def run_background(self, fn: Callable,
+                           on_finished: Callable[[TaskResult], None] = None,
+                           *args, **kwargs):
+            """
+            Chạy fn nền trên cùng thread pool nhưng không qua state machine
+            (không chiếm trạng thái busy, không log) - cho việc đọc nhẹ như scan
+            file để refresh UI. on_finished được gọi trên GUI thread.
+            """
+            worker = Worker(fn, *args, **kwargs)
+            self._background.add(worker)
+            
+            def handle_finished(result: TaskResult):
+                self._background.discard(worker)
+                if on_finished:
+                    on_finished(result)
+            
+            worker.signals.finished.connect(handle_finished)
+            self._pool.start(worker)
+        
         def cancel(self, task_id: str) -> bool:
             """Hủy task đang chạy"""
             if task_id in self._workers:
@@ -246,6 +266,18 @@ else:
             
             return task_id
         
+        def run_background(self, fn: Callable, on_finished: Callable = None,
+                           *args, **kwargs):
+            """Synchronous, không qua state machine"""
+            try:
+                result = fn(*args, **kwargs)
+                if not isinstance(result, TaskResult):
+                    result = TaskResult.success(str(result))
+            except Exception as e:
+                result = TaskResult.error(str(e))
+            if on_finished:
+                on_finished(result)
+        
         def cancel(self, task_id: str) -> bool:
             return False
         
@@ -2,17 +2,31 @@
 Utility functions cho RK ROM Kitchen
 """
 import os
-import shutil
+import ntpath
+import stat
 import time
-from pathlib import Path
+from functools import lru_cache
+from pathlib import Path, PureWindowsPath
 from datetime import datetime
-from typing import Union
+from typing import Iterator, Union
+
+
+# Bảng thay thế ký tự không hợp lệ trong tên file (build một lần)
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Đơn vị cho human_size, index = số lần chia 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+def _as_path(path: Union[str, Path]) -> Path:
+    """Path(path) nhưng bỏ qua construct lại nếu đã là Path"""
+    return path if isinstance(path, Path) else Path(os.fspath(path))
 
 
 def ensure_dir(path: Union[str, Path]) -> Path:
     """Tạo thư mục nếu chưa tồn tại, trả về Path object"""
-    p = Path(path)
-    p.mkdir(parents=True, exist_ok=True)
+    p = _as_path(path)
+    os.makedirs(p, exist_ok=True)
     return p
 
 
@@ -28,8 +42,9 @@ def safe_copy(src: Union[str, Path], dst: Union[str, Path], overwrite: bool = Fa
     Returns:
         Path đến file đích
     """
-    src_path = Path(src)
-    dst_path = Path(dst)
+    import shutil
+    src_path = _as_path(src)
+    dst_path = _as_path(dst)
     
     if not src_path.exists():
         raise FileNotFoundError(f"File nguồn không tồn tại: {src}")
@@ -53,27 +68,28 @@ def human_size(size_bytes: int) -> str:
     if size_bytes < 0:
         return "0 B"
     
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    unit_index = 0
-    size = float(size_bytes)
-    
-    while size >= 1024 and unit_index < len(units) - 1:
-        size /= 1024
-        unit_index += 1
+    size_bytes = int(size_bytes)
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
     
-    if unit_index == 0:
-        return f"{int(size)} {units[unit_index]}"
-    return f"{size:.2f} {units[unit_index]}"
+    # bit_length -> bậc 1024 trực tiếp, không cần vòng lặp chia
+    unit_index = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.2f} {_SIZE_UNITS[unit_index]}"
 
 
 def timestamp(fmt: str = "%Y%m%d_%H%M%S") -> str:
     """Trả về timestamp string hiện tại"""
-    return datetime.now().strftime(fmt)
+    lt = time.localtime()
+    if fmt == "%Y%m%d_%H%M%S":
+        # Format mặc định: ghép trực tiếp từ struct_time, không qua strftime
+        return (f"{lt.tm_year:04d}{lt.tm_mon:02d}{lt.tm_mday:02d}_"
+                f"{lt.tm_hour:02d}{lt.tm_min:02d}{lt.tm_sec:02d}")
+    return time.strftime(fmt, lt)
 
 
 def timestamp_iso() -> str:
-    """Trả về ISO format timestamp"""
-    return datetime.now().isoformat()
+    """Trả về ISO format timestamp (độ chính xác giây)"""
+    return datetime.now().isoformat(timespec='seconds')
 
 
 def elapsed_ms(start_time: float) -> int:
@@ -83,53 +99,78 @@ def elapsed_ms(start_time: float) -> int:
 
 def sanitize_filename(name: str) -> str:
     """Loại bỏ các ký tự không hợp lệ trong tên file"""
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
-    return name.strip()
+    return name.translate(_SANITIZE_TABLE).strip()
 
 
 def get_file_info(path: Union[str, Path]) -> dict:
     """Lấy thông tin cơ bản của file"""
-    p = Path(path)
-    if not p.exists():
+    p = _as_path(path)
+    try:
+        st = os.stat(p)
+    except (OSError, ValueError):
         return {"exists": False}
     
-    stat = p.stat()
+    # Một lần stat duy nhất, is_file/is_dir suy ra từ st_mode
+    is_file = stat.S_ISREG(st.st_mode)
     return {
         "exists": True,
         "name": p.name,
-        "size": stat.st_size,
-        "size_human": human_size(stat.st_size),
-        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-        "is_file": p.is_file(),
-        "is_dir": p.is_dir(),
-        "extension": p.suffix.lower() if p.is_file() else None
+        "size": st.st_size,
+        "size_human": human_size(st.st_size),
+        "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
+        "is_file": is_file,
+        "is_dir": stat.S_ISDIR(st.st_mode),
+        "extension": p.suffix.lower() if is_file else None
     }
 
 
+def dir_mtimes(folders) -> tuple:
+    """
+    mtime_ns của từng folder (0 nếu không tồn tại).
+    Dùng làm stamp để cache kết quả scan không đệ quy: thêm/xóa entry trực tiếp
+    trong folder sẽ đổi mtime của folder đó.
+    """
+    stamps = []
+    for folder in folders:
+        try:
+            stamps.append(os.stat(folder).st_mtime_ns)
+        except (OSError, ValueError):
+            stamps.append(0)
+    return tuple(stamps)
+
+
+def iter_files(folder: Union[str, Path], pattern: str = "*") -> Iterator[Path]:
+    """
+    Duyệt lazy các files trong folder theo pattern.
+    Pattern không có wildcard -> check trực tiếp, không glob.
+    """
+    p = _as_path(folder)
+    if not p.is_dir():
+        return
+    if not any(c in pattern for c in '*?['):
+        target = p / pattern
+        if target.exists():
+            yield target
+        return
+    yield from p.glob(pattern)
+
+
 def list_files(folder: Union[str, Path], pattern: str = "*") -> list:
     """Liệt kê files trong folder theo pattern"""
-    p = Path(folder)
-    if not p.is_dir():
-        return []
-    return list(p.glob(pattern))
+    return list(iter_files(folder, pattern))
 
 
 def clean_folder(folder: Union[str, Path], keep_folder: bool = True):
     """Xóa nội dung trong folder"""
-    p = Path(folder)
+    p = _as_path(folder)
     if not p.exists():
         return
     
+    import shutil
+    # rmtree một lần rồi tạo lại folder rỗng, thay vì unlink từng item
+    shutil.rmtree(p)
     if keep_folder:
-        for item in p.iterdir():
-            if item.is_file():
-                item.unlink()
-            elif item.is_dir():
-                shutil.rmtree(item)
-    else:
-        shutil.rmtree(p)
+        p.mkdir(parents=True, exist_ok=True)
 
 
 def resolve_relative_path(project_root: Path, path_str: str) -> Path:
@@ -145,32 +186,30 @@ def resolve_relative_path(project_root: Path, path_str: str) -> Path:
     Returns:
         Path đã resolve absolute
     """
-    # Logic cross-platform: check if path matches Windows absolute pattern
-    import ntpath
-    from pathlib import PureWindowsPath
+    # Thao tác trên string, chỉ wrap Path ở cuối
+    s = os.fspath(path_str)
+    root = os.fspath(project_root)
     
-    # 1. Check if path_str is Windows absolute (e.g. C:\foo or \\server\share)
-    # Using ntpath.isabs covers C:\ on all platforms.
-    # Also check UNC explicitly if ntpath doesn't cover it on Linux (it should, but safety first)
-    is_win_abs = ntpath.isabs(path_str) or path_str.startswith("\\\\")
+    # 1. Absolute theo OS hiện tại -> Path thật (trên Windows os.path là ntpath)
+    if os.path.isabs(s):
+        return Path(s)
     
-    if is_win_abs:
-        return PureWindowsPath(path_str)
-        
-    # 2. Check regular local Path absolute (e.g. /usr/bin/foo on Linux)
-    p = Path(path_str)
-    if p.is_absolute():
-        return p
-        
-    # 3. Handle relative path joining
-    # Check if project_root looks like Windows path
-    root_str = str(project_root)
-    is_root_win = ntpath.isabs(root_str) or root_str.startswith("\\\\") or (len(root_str) > 1 and root_str[1] == ':')
+    # 2. Windows absolute (C:\foo, \\server\share) khi chạy trên OS khác
+    if _is_windows_root(s) and ntpath.isabs(s):
+        return PureWindowsPath(s)
     
-    if is_root_win:
-        return PureWindowsPath(project_root) / PureWindowsPath(path_str)
-        
-    return project_root / p
+    # 3. Relative: join với project_root, giữ flavour Windows nếu root là Windows path
+    if os.name != 'nt' and _is_windows_root(root):
+        return PureWindowsPath(ntpath.join(root, s))
+    
+    return Path(os.path.join(root, s))
+
+
+@lru_cache(maxsize=64)
+def _is_windows_root(root_str: str) -> bool:
+    """project_root có drive/UNC kiểu Windows không (cache theo string)"""
+    # Không dùng ntpath.isabs: '/tmp/x' cũng là rooted với ntpath
+    return bool(ntpath.splitdrive(root_str)[0])
 
 
 def restart_application():
@@ -3,7 +3,7 @@ Workspace Manager (Global)
 Quản lý Global Workspace: Projects/, tools/, logs/
 """
 import os
-import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -15,10 +15,13 @@ def _get_settings():
     from .settings_store import get_settings_store
     return get_settings_store()
 
+@lru_cache(maxsize=1)
 def get_workspace_root() -> Path:
     """
     Lấy đường dẫn workspace root từ Settings.
     Raise WorkspaceNotConfiguredError nếu chưa setup.
+    
+    Kết quả được cache; set_workspace_root() sẽ invalidate.
     """
     s = _get_settings()
     path_str = s.get("workspace_root")
@@ -41,6 +44,7 @@ def set_workspace_root(path: Path):
     s = _get_settings()
     s.set("workspace_root", str(path))
     s.save()
+    get_workspace_root.cache_clear()
     # Auto ensure layout
     Workspace(path)
 
@@ -48,6 +52,8 @@ def set_workspace_root(path: Path):
 class Workspace:
     """Quản lý Global Workspace"""
     
+    __slots__ = ('_root',)
+    
     def __init__(self, root: Optional[Path] = None):
         """
         Args:
@@ -105,22 +111,17 @@ class Workspace:
     def create_project_structure(self, name: str) -> Path:
         """Tạo project mới trong Projects/"""
         project_path = self.projects_dir / name
+        root = os.fspath(project_path)
         
-        dirs = [
-            project_path / 'in',
-            project_path / 'out' / 'Source',
-            project_path / 'out' / 'Image',
-            project_path / 'temp',
-            project_path / 'logs',
-            project_path / 'config',
-        ]
-        
-        for d in dirs:
-            ensure_dir(d)
+        # os.makedirs trên str, không tạo Path trung gian cho từng folder
+        for sub in ('in', os.path.join('out', 'Source'), os.path.join('out', 'Image'),
+                    'temp', 'logs', 'config'):
+            os.makedirs(os.path.join(root, sub), exist_ok=True)
         
         return project_path
     
     def delete_project(self, name: str) -> bool:
+        import shutil
         project_path = self.projects_dir / name
         if not project_path.exists():
             return False
@@ -140,8 +141,9 @@ class Workspace:
                 total += p.stat().st_size
         return total
 
-# Singleton instance
+# Singleton instance (+ str(root) để so sánh nhanh, không qua Path.__eq__)
 _workspace: Optional[Workspace] = None
+_workspace_key: Optional[str] = None
 
 def migrate_workspace(old_root: Path, new_root: Path, mode: str):
     """
@@ -150,6 +152,7 @@ def migrate_workspace(old_root: Path, new_root: Path, mode: str):
     """
     if mode == 'SKIP':
         return
+    import shutil
 
     # Ensure dest layout
     Workspace(new_root) 
@@ -172,31 +175,65 @@ def migrate_workspace(old_root: Path, new_root: Path, mode: str):
             if mode == 'COPY':
                 _copy_tree_merge(src, dst)
             elif mode == 'MOVE':
-                _copy_tree_merge(src, dst)
+                _copy_tree_merge(src, dst, move=True)
                 shutil.rmtree(src)
         except Exception as e:
             raise RuntimeError(f"Lỗi khi migrate ({mode}) {relative}: {e}")
 
-def _copy_tree_merge(src: Path, dst: Path):
-    """Copy recursive, merge if exists"""
-    if not dst.exists():
-        shutil.copytree(src, dst)
+def _copy_tree_merge(src: Path, dst: Path, move: bool = False):
+    """
+    Copy (hoặc move) cây thư mục, merge nếu đích đã tồn tại.
+    Không ghi đè file đã có ở đích.
+    
+    COPY dùng shutil.copytree(dirs_exist_ok=True).
+    MOVE duyệt bằng stack + os.scandir, thử os.rename trước (cùng ổ đĩa -> không copy data),
+    lỗi thì fallback copy. Caller chịu trách nhiệm xóa src sau cùng.
+    """
+    import shutil
+    if not move:
+        # COPY: copytree(dirs_exist_ok) merge trong một lần gọi
+        shutil.copytree(src, dst, dirs_exist_ok=True, copy_function=_copy_if_absent)
         return
+    
+    stack = [(os.fspath(src), os.fspath(dst))]
+    while stack:
+        s, d = stack.pop()
+        os.makedirs(d, exist_ok=True)
+        with os.scandir(s) as it:
+            for entry in it:
+                target = os.path.join(d, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    if not os.path.lexists(target):
+                        try:
+                            os.rename(entry.path, target)
+                            continue
+                        except OSError:
+                            pass
+                    stack.append((entry.path, target))
+                    continue
+                
+                if os.path.lexists(target):  # Don't overwrite existing
+                    continue
+                try:
+                    os.rename(entry.path, target)
+                    continue
+                except OSError:
+                    pass
+                shutil.copy2(entry.path, target)
 
-    for item in src.iterdir():
-        d = dst / item.name
-        if item.is_dir():
-            _copy_tree_merge(item, d)
-        else:
-            if not d.exists(): # Don't overwrite existing
-                shutil.copy2(item, d)
+def _copy_if_absent(src: str, dst: str) -> str:
+    """copy_function cho copytree: không ghi đè file đã có"""
+    if os.path.lexists(dst):
+        return dst
+    import shutil
+    return shutil.copy2(src, dst)
 
 def get_workspace(root: Optional[Path] = None) -> Workspace:
     """Lấy singleton (hoặc tạo mới nếu root thay đổi/chưa có)"""
-    global _workspace
-    if _workspace is None:
-        _workspace = Workspace(root)
-    elif root and _workspace.root != root:
-        _workspace = Workspace(root)
+    global _workspace, _workspace_key
+    if _workspace is None or (root and str(root) != _workspace_key):
+        ws = Workspace(root)
+        _workspace_key = str(ws.root)
+        _workspace = ws
     return _workspace
 
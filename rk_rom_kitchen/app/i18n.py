@@ -3,11 +3,16 @@ Internationalization (i18n) module
 Hỗ trợ VI/EN với default VI
 Technical terms giữ nguyên English
 """
+import re
+import sys
 from typing import Dict
 
 # Ngôn ngữ mặc định
 DEFAULT_LANG = "vi"
 
+# Placeholder "{name}" -> chuyển sang "%(name)s" khi build bảng format
+_BRACE_RE = re.compile(r"\{(\w+)\}")
+
 # Translations
 TRANSLATIONS: Dict[str, Dict[str, str]] = {
     # ===== Main Window =====
@@ -141,15 +146,62 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
     "placeholder": {"vi": "—", "en": "—"},
 }
 
-# Current language
+SUPPORTED_LANGS = ("vi", "en")
+
+
+def _build_tables(translations: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Flatten translations {key: {lang: text}} thành {lang: {key: text}} một lần khi import.
+    Thiếu bản dịch -> fallback EN, rồi tới key.
+    Key được intern để khớp pointer với literal ở call site.
+    """
+    tables: Dict[str, Dict[str, str]] = {lang: {} for lang in SUPPORTED_LANGS}
+    for key, entry in translations.items():
+        key = sys.intern(key)
+        fallback = entry.get("en", key)
+        for lang, table in tables.items():
+            table[key] = entry.get(lang, fallback)
+    return tables
+
+
+def _build_fmt_tables(tables: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """
+    Convert template "{name}" -> "%(name)s" một lần khi import để t_fmt() dùng toán tử %.
+    Chỉ chứa các key có placeholder dạng {name} đơn giản.
+    """
+    fmt_tables: Dict[str, Dict[str, str]] = {}
+    for lang, table in tables.items():
+        converted = {}
+        for key, text in table.items():
+            if '{' not in text:
+                continue
+            pct = _BRACE_RE.sub(r"%(\1)s", text.replace('%', '%%'))
+            # Còn {} / {0!r} / {x:>4}... -> để str.format xử lý
+            if '{' not in pct and '}' not in pct:
+                converted[key] = pct
+        fmt_tables[lang] = converted
+    return fmt_tables
+
+
+_TABLE = _build_tables(TRANSLATIONS)
+_FMT_TABLE = _build_fmt_tables(_TABLE)
+# Dạng nested chỉ dùng để khai báo; sau khi flatten thì bỏ để giải phóng các dict con
+del TRANSLATIONS
+
+# Current language + bảng dịch đang active (t() chỉ cần 1 dict lookup)
 _current_lang = DEFAULT_LANG
+_ACTIVE = _TABLE[DEFAULT_LANG]
+_ACTIVE_FMT = _FMT_TABLE[DEFAULT_LANG]
 
 
 def set_language(lang: str):
     """Set ngôn ngữ hiện tại"""
-    global _current_lang
-    if lang in ("vi", "en"):
-        _current_lang = lang
+    global _current_lang, _ACTIVE, _ACTIVE_FMT
+    if lang not in SUPPORTED_LANGS or lang == _current_lang:
+        return
+    _current_lang = lang
+    _ACTIVE = _TABLE[lang]
+    _ACTIVE_FMT = _FMT_TABLE[lang]
 
 
 def get_language() -> str:
@@ -157,29 +209,39 @@ def get_language() -> str:
     return _current_lang
 
 
-def t(key: str, **kwargs) -> str:
+def t(key: str) -> str:
     """
     Translate một key sang ngôn ngữ hiện tại
     
     Args:
         key: Translation key
-        **kwargs: Format arguments
         
     Returns:
         Translated string hoặc key nếu không tìm thấy
     """
-    trans = TRANSLATIONS.get(key, {})
-    text = trans.get(_current_lang, trans.get("en", key))
+    return _ACTIVE.get(key, key)
+
+
+def t_fmt(key: str, **kwargs) -> str:
+    """
+    Translate + format với kwargs (vd: t_fmt("msg", name="x"))
     
-    if kwargs:
+    Returns:
+        Translated string đã format, hoặc chưa format nếu thiếu placeholder
+    """
+    pct = _ACTIVE_FMT.get(key)
+    if pct is not None:
         try:
-            text = text.format(**kwargs)
+            return pct % kwargs
         except KeyError:
-            pass
+            return _ACTIVE.get(key, key)
     
-    return text
+    text = _ACTIVE.get(key, key)
+    try:
+        return text.format_map(kwargs)
+    except (KeyError, IndexError, ValueError):
+        return text
 
 
-def tr(key: str, **kwargs) -> str:
-    """Alias cho t()"""
-    return t(key, **kwargs)
+# Alias cho t()
+tr = t
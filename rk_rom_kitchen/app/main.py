@@ -4,9 +4,12 @@ Công cụ mod ROM cho thiết bị Rockchip
 """
 import sys
 import os
+from functools import lru_cache
 
-# Add parent to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent to path for imports (chỉ khi chạy trực tiếp; import từ package thì không cần)
+if __name__ == "__main__":
+    _HERE = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(_HERE))
 
 from PyQt5.QtWidgets import QApplication, QMessageBox, QFileDialog
 from PyQt5.QtCore import Qt
@@ -15,18 +18,22 @@ from app.core.crash_guard import setup_global_exception_hooks
 from app.core.errors import WorkspaceNotConfiguredError
 from app.core.workspace import get_workspace_root, set_workspace_root
 from app.i18n import set_language
-from app.core.settings_store import get_settings_store
-from app.core.logbus import get_log_bus
-from app.ui.main_window import MainWindow
+from app.core.settings_store import get_settings_store, get_appdata_dir
+
+
+@lru_cache(maxsize=1)
+def _enable_high_dpi():
+    """Bật high DPI attributes (một lần, MUST be before QApplication)"""
+    for attr in ('AA_EnableHighDpiScaling', 'AA_UseHighDpiPixmaps'):
+        value = getattr(Qt, attr, None)
+        if value is not None:
+            QApplication.setAttribute(value, True)
 
 
 def main():
     """Main entry point"""
     # Enable high DPI (MUST be before QApplication)
-    if hasattr(Qt, 'AA_EnableHighDpiScaling'):
-        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
-        QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    _enable_high_dpi()
 
     # Create Qt application first (needed for Dialogs)
     app = QApplication(sys.argv)
@@ -41,12 +48,12 @@ def main():
         get_workspace_root()
     except WorkspaceNotConfiguredError:
         # Show Explanation
-        msg = QMessageBox()
-        msg.setWindowTitle("Cấu hình Workspace")
-        msg.setText("Chào mừng đến với RK ROM Kitchen!\n\nVui lòng chọn thư mục Workspace để lưu trữ Projects, Tools và Logs.\n\nKhuyến nghị: Documents/RK_Kitchen_Data")
-        msg.setIcon(QMessageBox.Information)
-        msg.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
-        if msg.exec_() != QMessageBox.Ok:
+        btn = QMessageBox.information(
+            None, "Cấu hình Workspace",
+            "Chào mừng đến với RK ROM Kitchen!\n\nVui lòng chọn thư mục Workspace để lưu trữ Projects, Tools và Logs.\n\nKhuyến nghị: Documents/RK_Kitchen_Data",
+            QMessageBox.Ok | QMessageBox.Cancel
+        )
+        if btn != QMessageBox.Ok:
             sys.exit(0)
             
         # Select Folder
@@ -70,9 +77,10 @@ def main():
     lang = settings.get('language', 'vi')
     set_language(lang)
     
-    # Setup log bus
+    # Setup log bus (import trễ: nhánh chưa có workspace không cần load UI)
+    from app.core.logbus import get_log_bus
+    from app.ui.main_window import MainWindow
     log = get_log_bus()
-    from app.core.settings_store import get_appdata_dir
     log_file = get_appdata_dir() / 'app.log'
     log.set_log_file(log_file)
     
@@ -0,0 +1,60 @@
+"""
+Audit Scan Helper
+Dùng chung cho các audit test (test_no_*): đọc mỗi file .py trong app/ (exclude tests)
+một lần, match tất cả forbidden patterns bằng một regex duy nhất.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# app/ (tính một lần khi import)
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Tất cả substrings bị cấm trong runtime code
+PATCHED_SPARSE_PATTERN = "_patched_sparse.img"
+UNSAFE_REPLACE_PATTERNS = (
+    "replace('_a'",
+    'replace("_a"',
+    "replace('_b'",
+    'replace("_b"',
+)
+AUDIT_PATTERNS = (PATCHED_SPARSE_PATTERN,) + UNSAFE_REPLACE_PATTERNS
+
+# Một pass regex trên bytes thay cho N lần substring check / file
+_AUDIT_RE = re.compile(b"|".join(re.escape(p.encode("utf-8")) for p in AUDIT_PATTERNS))
+
+
+@lru_cache(maxsize=1)
+def _py_files() -> Tuple[Path, ...]:
+    """Danh sách .py runtime trong app/ (exclude tests), cache cho cả process"""
+    return tuple(p for p in APP_DIR.rglob("*.py") if "tests" not in p.parts)
+
+
+@lru_cache(maxsize=1)
+def scan_app_sources() -> Dict[str, List[Tuple[Path, int, str]]]:
+    """
+    Scan app/ một lần (cache cho cả test run).
+    
+    Returns:
+        {pattern: [(py_file, lineno, line_preview), ...]}
+    """
+    hits: Dict[str, List[Tuple[Path, int, str]]] = {p: [] for p in AUDIT_PATTERNS}
+    
+    for py_file in _py_files():
+        try:
+            raw = py_file.read_bytes()
+        except OSError:
+            continue  # Skip unreadable files
+        
+        if not _AUDIT_RE.search(raw):
+            continue
+        
+        # Chỉ decode + split khi có hit -> lấy line number để debug
+        content = raw.decode("utf-8", "ignore")
+        for lineno, line in enumerate(content.splitlines(), 1):
+            for pattern in AUDIT_PATTERNS:
+                if pattern in line:
+                    hits[pattern].append((py_file, lineno, line.strip()[:80]))
+    
+    return hits
@@ -11,6 +11,8 @@ Tests:
 """
 import sys
 import os
+import importlib
+import importlib.util
 import tempfile
 import shutil
 from pathlib import Path
@@ -19,6 +21,55 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 
+# Modules cần import được (dạng data, import bằng importlib)
+CORE_MODULES = (
+    "app.core.errors",
+    "app.core.utils",
+    "app.core.logbus",
+    "app.core.settings_store",
+    "app.core.workspace",
+    "app.core.project_store",
+    "app.core.detect",
+    "app.core.state_machine",
+    "app.core.task_defs",
+    "app.core.pipeline",
+    "app.core.app_context",
+    # Phase 2 core modules
+    "app.core.build_image",
+    "app.core.avb_manager",
+    "app.core.debloater",
+    "app.core.boot_manager",
+    "app.core.magisk_patcher",
+    
+    "app.tools.runner",
+    "app.tools.registry",
+    "app.tools.rockchip",
+    "app.tools.android_images",
+    "app.tools.avb",
+    "app.tools.fs",
+    
+    "app.i18n",
+    "app.core.crash_guard",
+)
+
+UI_MODULES = (
+    "app.ui.main_window",
+    "app.ui.pages.page_build_image",
+    "app.ui.pages.page_avb",
+    "app.ui.pages.page_magisk",
+    "app.ui.pages.page_boot_unpack",
+    "app.ui.dialogs.debloater_dialog",
+)
+
+
+def _module_available(name: str) -> bool:
+    """find_spec probe, không exec module"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 def test_imports():
     """Test 1: Import core modules"""
     print("=" * 50)
@@ -26,49 +77,19 @@ def test_imports():
     print("=" * 50)
     
     try:
-        from app.core import errors
-        from app.core import utils
-        from app.core import logbus
-        from app.core import settings_store
-        from app.core import workspace
-        from app.core import project_store
-        from app.core import detect
-        from app.core import state_machine
-        from app.core import task_defs
-        from app.core import pipeline
-        from app.core import app_context
-        # Phase 2 core modules
-        from app.core import build_image
-        from app.core import avb_manager
-        from app.core import debloater
-        from app.core import boot_manager
-        from app.core import magisk_patcher
-        
-        from app.tools import runner
-        from app.tools import registry
-        from app.tools import rockchip
-        from app.tools import android_images
-        from app.tools import avb
-        from app.tools import fs
-        
-        from app import i18n
-        from app.core import crash_guard
+        for name in CORE_MODULES:
+            importlib.import_module(name)
         
         print("[OK] All core modules imported successfully")
         
-        # UI imports (optional unless strict)
-        try:
-            from app.ui import main_window
-            from app.ui.pages import page_build_image
-            from app.ui.pages import page_avb
-            from app.ui.pages import page_magisk
-            from app.ui.pages import page_boot_unpack
-            from app.ui.dialogs import debloater_dialog
+        # UI: import thật khi có PyQt5 (bắt lỗi import-time của pages/widgets);
+        # strict mode (RK_SMOKE_REQUIRE_UI=1) bắt buộc import kể cả khi thiếu PyQt5
+        if os.getenv("RK_SMOKE_REQUIRE_UI") == "1" or _module_available("PyQt5"):
+            for name in UI_MODULES:
+                importlib.import_module(name)
             print("[OK] All UI modules imported successfully")
-        except ImportError as e:
-            if os.getenv("RK_SMOKE_REQUIRE_UI") == "1":
-                raise e
-            print(f"[SKIP] UI imports skipped (missing deps?): {e}")
+        else:
+            print("[SKIP] UI imports skipped (PyQt5 not installed)")
 
         return True
     except ImportError as e:
@@ -209,26 +230,26 @@ def test_detect():
     temp_dir = Path(tempfile.mkdtemp(prefix="rk_detect_test_"))
     
     try:
+        # Tạo trước các file rỗng (os.open O_CREAT, không stat/utime như touch)
+        for name in ("update.img", "release_update.img", "super.img", "random.bin"):
+            os.close(os.open(str(temp_dir / name), os.O_WRONLY | os.O_CREAT, 0o644))
+        
         # Test update.img
-        (temp_dir / "update.img").touch()
         result = detect_rom_type(temp_dir / "update.img")
         assert result == RomType.UPDATE_IMG, f"Expected UPDATE_IMG, got {result}"
         print(f"[OK] update.img -> {result.value}")
         
         # Test release_update.img
-        (temp_dir / "release_update.img").touch()
         result = detect_rom_type(temp_dir / "release_update.img")
         assert result == RomType.RELEASE_UPDATE_IMG
         print(f"[OK] release_update.img -> {result.value}")
         
         # Test super.img
-        (temp_dir / "super.img").touch()
         result = detect_rom_type(temp_dir / "super.img")
         assert result == RomType.SUPER_IMG
         print(f"[OK] super.img -> {result.value}")
         
         # Test unknown
-        (temp_dir / "random.bin").touch()
         result = detect_rom_type(temp_dir / "random.bin")
         assert result == RomType.UNKNOWN
         print(f"[OK] random.bin -> {result.value}")
@@ -341,12 +362,8 @@ def main():
     print("SUMMARY")
     print("=" * 50)
     
-    all_passed = True
-    for name, passed in results.items():
-        status = "[OK] PASS" if passed else "[FAIL]"
-        print(f"  {name}: {status}")
-        if not passed:
-            all_passed = False
+    print("\n".join(f"  {name}: {'[OK] PASS' if passed else '[FAIL]'}" for name, passed in results.items()))
+    all_passed = all(results.values())
     
     print()
     if all_passed:
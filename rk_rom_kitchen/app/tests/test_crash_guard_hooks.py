@@ -26,8 +26,8 @@ class TestCrashGuardHooks(unittest.TestCase):
             
         # Patch LOG_DIR in crash_guard logic?
         # crash_guard.LOG_DIR is a global constant defined at module level.
-        # We can patch it.
-        self.patcher = patch("app.core.crash_guard.LOG_DIR", self.test_log_dir)
+        # We can patch it (module đã import sẵn -> patch.object).
+        self.patcher = patch.object(crash_guard, "LOG_DIR", self.test_log_dir)
         self.patcher.start()
 
     def tearDown(self):
@@ -69,5 +69,29 @@ class TestCrashGuardHooks(unittest.TestCase):
         self.assertIn("Simulated Crash", content)
         self.assertIn("ValueError", content)
 
+    def test_reentrant_crash_falls_back(self):
+        """Crash while handling a crash -> default hook, no second log"""
+        crash_guard.setup_global_exception_hooks(log_to_file=True)
+        hook = sys.excepthook
+        
+        def crash_again(*args, **kwargs):
+            try:
+                raise RuntimeError("Nested Crash")
+            except RuntimeError:
+                hook(*sys.exc_info())
+            return original_log(*args, **kwargs)
+        
+        original_log = crash_guard.log_crash
+        with patch("app.core.crash_guard.log_crash", side_effect=crash_again) as mock_log, \
+             patch("sys.__excepthook__") as mock_default:
+            try:
+                raise ValueError("Simulated Crash")
+            except ValueError:
+                hook(*sys.exc_info())
+        
+        self.assertEqual(mock_log.call_count, 1)
+        mock_default.assert_called_once()
+        self.assertIs(mock_default.call_args[0][0], RuntimeError)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,43 @@
+"""
+Test i18n.t_fmt: đường % (template convert sẵn), fallback khi thiếu placeholder,
+và fallback str.format cho template phức tạp
+"""
+import unittest
+from unittest.mock import patch
+
+from app import i18n
+
+TEXTS = {
+    "msg_simple": "Xin chào {name}, xong 100%",
+    "msg_spec": "Size: {size:>6} MB",
+}
+
+class TestTFmt(unittest.TestCase):
+
+    def setUp(self):
+        fmt = i18n._build_fmt_tables({"vi": TEXTS})["vi"]
+        # Patch bảng đang active (restore sau test), không đổi ngôn ngữ global
+        for target, values in ((i18n._ACTIVE, TEXTS), (i18n._ACTIVE_FMT, fmt)):
+            patcher = patch.dict(target, values)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_simple_template_converted_to_percent(self):
+        self.assertEqual(i18n._ACTIVE_FMT["msg_simple"], "Xin chào %(name)s, xong 100%%")
+        self.assertNotIn("msg_spec", i18n._ACTIVE_FMT)
+
+    def test_percent_path(self):
+        self.assertEqual(i18n.t_fmt("msg_simple", name="RK"), "Xin chào RK, xong 100%")
+
+    def test_missing_placeholder_returns_unformatted(self):
+        self.assertEqual(i18n.t_fmt("msg_simple"), TEXTS["msg_simple"])
+        self.assertEqual(i18n.t_fmt("msg_spec", other=1), TEXTS["msg_spec"])
+
+    def test_str_format_fallback(self):
+        self.assertEqual(i18n.t_fmt("msg_spec", size=42), "Size:     42 MB")
+
+    def test_unknown_key_returns_key(self):
+        self.assertEqual(i18n.t_fmt("no_such_key", name="x"), "no_such_key")
+
+if __name__ == '__main__':
+    unittest.main()
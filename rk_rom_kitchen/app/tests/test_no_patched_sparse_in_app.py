@@ -3,8 +3,8 @@ Test No Patched Sparse in App
 Global audit: không có "_patched_sparse.img" trong app/ (ngoại trừ tests)
 """
 import unittest
-import os
-from pathlib import Path
+
+from app.tests._audit_scan import scan_app_sources, PATCHED_SPARSE_PATTERN
 
 
 class TestNoPatchedSparseInApp(unittest.TestCase):
@@ -15,28 +15,10 @@ class TestNoPatchedSparseInApp(unittest.TestCase):
         Scan tất cả .py trong app/ (exclude app/tests)
         Assert không có substring "_patched_sparse.img"
         """
-        # Find app directory
-        this_file = Path(__file__).resolve()
-        tests_dir = this_file.parent  # app/tests
-        app_dir = tests_dir.parent    # app/
-        
-        violations = []
-        
-        # Walk app/ excluding tests/
-        for py_file in app_dir.rglob("*.py"):
-            # Skip test files
-            if "tests" in py_file.parts:
-                continue
-            
-            try:
-                content = py_file.read_text(encoding="utf-8", errors="ignore")
-                if "_patched_sparse.img" in content:
-                    # Find line number for better debugging
-                    for lineno, line in enumerate(content.splitlines(), 1):
-                        if "_patched_sparse.img" in line:
-                            violations.append(f"{py_file.name}:{lineno}: {line.strip()[:80]}")
-            except Exception as e:
-                pass  # Skip unreadable files
+        violations = [
+            f"{py_file.name}:{lineno}: {line}"
+            for py_file, lineno, line in scan_app_sources()[PATCHED_SPARSE_PATTERN]
+        ]
         
         self.assertEqual(
             len(violations), 0,
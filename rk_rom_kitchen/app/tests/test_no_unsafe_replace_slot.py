@@ -3,7 +3,8 @@ Test No Unsafe Replace Slot
 Đảm bảo không còn replace('_a','') / replace('_b','') unsafe trong runtime code
 """
 import unittest
-from pathlib import Path
+
+from app.tests._audit_scan import scan_app_sources, UNSAFE_REPLACE_PATTERNS
 
 
 class TestNoUnsafeReplaceSlot(unittest.TestCase):
@@ -14,40 +15,15 @@ class TestNoUnsafeReplaceSlot(unittest.TestCase):
         Scan tất cả .py trong app/ (exclude app/tests)
         Assert không chứa unsafe replace patterns
         """
-        # Find app directory
-        this_file = Path(__file__).resolve()
-        tests_dir = this_file.parent  # app/tests
-        app_dir = tests_dir.parent    # app/
-        
-        unsafe_patterns = [
-            "replace('_a'",
-            'replace("_a"',
-            "replace('_b'",
-            'replace("_b"',
-        ]
-        
+        hits = scan_app_sources()
         violations = []
         
-        # Walk app/ excluding tests/
-        for py_file in app_dir.rglob("*.py"):
-            # Skip test files
-            if "tests" in py_file.parts:
-                continue
-            
-            # Allow slot_utils.py (nó chứa docstring nói về vấn đề này)
-            if py_file.name == "slot_utils.py":
-                continue
-            
-            try:
-                content = py_file.read_text(encoding="utf-8", errors="ignore")
-                for pattern in unsafe_patterns:
-                    if pattern in content:
-                        # Find line number
-                        for lineno, line in enumerate(content.splitlines(), 1):
-                            if pattern in line:
-                                violations.append(f"{py_file.name}:{lineno}: {line.strip()[:80]}")
-            except Exception:
-                pass
+        for pattern in UNSAFE_REPLACE_PATTERNS:
+            for py_file, lineno, line in hits[pattern]:
+                # Allow slot_utils.py (nó chứa docstring nói về vấn đề này)
+                if py_file.name == "slot_utils.py":
+                    continue
+                violations.append(f"{py_file.name}:{lineno}: {line}")
         
         self.assertEqual(
             len(violations), 0,
@@ -1,16 +1,30 @@
 """
 Test Registry Auto-Detect and Priority
 """
+import os
+import threading
 import unittest
 import shutil
+import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from app.core import settings_store
 from app.tools import registry
 
 class TestRegistryPriority(unittest.TestCase):
     
     def setUp(self):
+        # Settings (tool_check_cache) ghi vào APPDATA tạm, không đụng settings.json thật
+        tmp = tempfile.TemporaryDirectory(prefix="rk_test_appdata_", ignore_cleanup_errors=True)
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.dict(os.environ, {"APPDATA": tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings_store.get_appdata_dir.cache_clear()
+        settings_store.SettingsStore._instance = None
+        
+        registry._REGISTRY = None # Singleton có thể đã build ở test khác
         self.tmp_ws = Path("temp_reg_priority_ws")
         self.tmp_bundled = Path("temp_reg_bundled")
         
@@ -38,7 +52,9 @@ class TestRegistryPriority(unittest.TestCase):
     def tearDown(self):
         if self.tmp_ws.exists(): shutil.rmtree(self.tmp_ws)
         if self.tmp_bundled.exists(): shutil.rmtree(self.tmp_bundled)
-        registry.ToolRegistry._instance = None # Reset singleton
+        registry._REGISTRY = None # Reset singleton
+        settings_store.get_appdata_dir.cache_clear()
+        settings_store.SettingsStore._instance = None
 
     @patch("app.core.workspace.get_workspace")
     def test_registry_priority_workspace_over_bundled(self, mock_get_workspace):
@@ -49,7 +65,7 @@ class TestRegistryPriority(unittest.TestCase):
         mock_get_workspace.return_value = mock_ws
         
         # Init registry
-        reg = registry.ToolRegistry()
+        reg = registry.get_tool_registry()
         
         # Detect
         # We need "img_unpack" definition in registry to look for img_unpack.exe
@@ -60,22 +76,110 @@ class TestRegistryPriority(unittest.TestCase):
         self.assertEqual(info.path.resolve(), self.ws_tool.resolve())
 
     @patch("app.core.workspace.get_workspace")
-    def test_registry_autodetect_on_init(self, mock_get_workspace):
-        """Tools should be detected immediately on init"""
-        reg = registry.ToolRegistry()
-        # Should have run detect
-        # We didn't setup any tools, so they should be missing, but 'detect_all' was called.
-        # How to check? info.error == 'Not found' means it ran.
-        info = reg.get_tool("img_unpack")
+    def test_registry_autodetect_on_first_lookup(self, mock_get_workspace):
+        """Chỉ tool được hỏi mới detect (một lần), không full scan lúc khởi tạo"""
+        with patch.object(registry.ToolRegistry, 'detect_all', autospec=True) as mock_detect, \
+             patch.object(registry.ToolRegistry, '_detect_tool', autospec=True,
+                          side_effect=registry.ToolRegistry._detect_tool) as mock_tool:
+            reg = registry.get_tool_registry()
+            mock_tool.assert_not_called()
+            
+            reg.get_tool("img_unpack")
+            reg.is_available("IMG_UNPACK")
+            reg.get_tool_path("img_unpack")
+            mock_tool.assert_called_once_with(reg, "img_unpack")
+            mock_detect.assert_not_called()
+            
+            reg.get_missing_tools()  # Cần cả danh sách -> full scan
+            mock_detect.assert_called_once()
+        
+        # Detect thật: tool không có trong workspace mock -> error Not found hoặc bundled
+        registry._REGISTRY = None
+        info = registry.get_tool_registry().get_tool("img_unpack")
         self.assertIsNotNone(info)
-        # If it ran, available is False, error Not found.
-        # If it didn't run, info might differ? Defaults are 'available=False'.
+
+    @patch("app.core.workspace.get_workspace")
+    def test_version_cached_while_binary_unchanged(self, mock_get_workspace):
+        """Tool không đổi (mtime, size) -> không chạy lại version subprocess"""
+        mock_ws = MagicMock()
+        mock_ws.tools_dir = self.tmp_ws / "tools" / "win64"
+        mock_get_workspace.return_value = mock_ws
+        (mock_ws.tools_dir / "adb.exe").write_text("adb")
         
-        # Let's mock detect_all to verify call
-        with patch.object(registry.ToolRegistry, 'detect_all', wraps=reg.detect_all) as mock_detect:
-            registry.ToolRegistry._instance = None
-            reg2 = registry.ToolRegistry()
-            mock_detect.assert_called_once()
+        with patch.object(registry.ToolRegistry, "_get_version", return_value="1.0") as mock_ver, \
+             patch("app.core.settings_store.SettingsStore.set") as mock_set, \
+             patch("app.core.settings_store.SettingsStore.get", return_value=None):
+            reg = registry.get_tool_registry()
+            reg.detect_all()
+            calls_after_first = mock_ver.call_count
+            reg.detect_all()
+            
+            self.assertEqual(reg.get_tool("adb").version, "1.0")
+            self.assertEqual(mock_ver.call_count, calls_after_first)
+            mock_set.assert_called_once()
+
+    @patch("app.core.workspace.get_workspace")
+    def test_failed_version_probe_not_cached(self, mock_get_workspace):
+        """Probe lỗi/timeout ("") không được cache -> lần detect sau probe lại"""
+        mock_ws = MagicMock()
+        mock_ws.tools_dir = self.tmp_ws / "tools" / "win64"
+        mock_get_workspace.return_value = mock_ws
+        (mock_ws.tools_dir / "adb.exe").write_text("adb")
+        
+        with patch.object(registry.ToolRegistry, "_get_version", return_value="") as mock_ver, \
+             patch("app.core.settings_store.SettingsStore.set") as mock_set, \
+             patch("app.core.settings_store.SettingsStore.get", return_value=None):
+            reg = registry.get_tool_registry()
+            reg.detect_all()
+            calls_after_first = mock_ver.call_count
+            self.assertGreater(calls_after_first, 0)
+            reg.detect_all()
+            
+            self.assertEqual(mock_ver.call_count, 2 * calls_after_first)
+            self.assertEqual(reg.get_tool("adb").version, "")
+            mock_set.assert_not_called()
+
+    @patch("app.core.workspace.get_workspace")
+    def test_lazy_lookup_does_not_save_settings(self, mock_get_workspace):
+        """Lookup lazy (có thể ở worker thread) chỉ đánh dấu dirty, không ghi settings.json"""
+        mock_ws = MagicMock()
+        mock_ws.tools_dir = self.tmp_ws / "tools" / "win64"
+        mock_get_workspace.return_value = mock_ws
+        (mock_ws.tools_dir / "adb.exe").write_text("adb")
+        
+        with patch.object(registry.ToolRegistry, "_get_version", return_value="1.0"), \
+             patch("app.core.settings_store.SettingsStore.set") as mock_set, \
+             patch("app.core.settings_store.SettingsStore.get", return_value=None):
+            reg = registry.get_tool_registry()
+            self.assertEqual(reg.get_tool("adb").version, "1.0")
+            mock_set.assert_not_called()
+            
+            reg.save_check_cache()
+            mock_set.assert_called_once()
+
+    @patch("app.core.workspace.get_workspace")
+    def test_dir_changed_does_not_wait_for_detect_lock(self, mock_get_workspace):
+        """Watcher slot (GUI thread) không chờ _detect_lock; lookup kế tiếp detect lại"""
+        mock_ws = MagicMock()
+        mock_ws.tools_dir = self.tmp_ws / "tools" / "win64"
+        mock_get_workspace.return_value = mock_ws
+        
+        reg = registry.get_tool_registry()
+        self.assertTrue(reg.get_tool("img_unpack").available)
+        
+        # Worker đang giữ lock (vd: version probe chậm)
+        with reg._detect_lock:
+            done = threading.Event()
+            t = threading.Thread(target=lambda: (
+                reg._on_search_dir_changed(os.fspath(mock_ws.tools_dir)), done.set()))
+            t.start()
+            self.assertTrue(done.wait(2), "slot blocked on _detect_lock")
+            t.join()
+        
+        self.ws_tool.unlink()
+        info = reg.get_tool("img_unpack")
+        self.assertNotEqual(os.path.normcase(os.fspath(info.path or "")),
+                            os.path.normcase(os.fspath(self.ws_tool)))
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,33 @@
+"""
+Test ToolRunner: line đã buffer phải lên log khi tool im lặng, không chờ line kế tiếp
+"""
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from app.tools.runner import ToolRunner
+
+class TestRunnerLogFlush(unittest.TestCase):
+
+    def test_buffered_lines_flushed_while_tool_is_silent(self):
+        runner = ToolRunner()
+        runner._log = MagicMock()
+        emitted = []  # (thời điểm, message)
+        runner._log.debug.side_effect = lambda msg: emitted.append((time.monotonic(), msg))
+
+        script = "import time; print('a'); print('b', flush=True); time.sleep(1.5); print('c')"
+        start = time.monotonic()
+        result = runner.run([sys.executable, "-c", script], timeout=30)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.stdout, "a\nb\nc")
+        out = [(t - start, msg) for t, msg in emitted if msg.startswith("[OUT] ")]
+        # a, b phải lên log trong lúc tool còn sleep (batch riêng, trước khi in c)
+        b_at, b_msg = next((t, msg) for t, msg in out if "[OUT] b" in msg)
+        self.assertNotIn("[OUT] c", b_msg)
+        self.assertLess(b_at, 1.2)
+        self.assertIn("[OUT] c", out[-1][1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Test scan_project = scan_vbmeta_targets + find_fstab_files + find_boot_images
+"""
+import os
+import unittest
+import tempfile
+from pathlib import Path
+
+from app.core.project_store import Project
+from app.core.workspace import Workspace
+from app.core.avb_manager import scan_vbmeta_targets, find_fstab_files
+from app.core.boot_manager import find_boot_images
+from app.core.scan import scan_project
+
+class TestScanProject(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="rk_test_", ignore_cleanup_errors=True)
+        self.tmp_dir = Path(self._tmp.name)
+
+        self.ws = Workspace(self.tmp_dir)
+        self.ws.create_project_structure("test_proj")
+        self.project = Project("test_proj", workspace=self.ws)
+
+        p = self.project
+        files = [
+            p.in_dir / "vbmeta.img",
+            p.in_dir / "vbmeta_system_a.img",
+            p.in_dir / "boot.img",
+            p.out_image_dir / "update" / "partitions" / "vbmeta_a.img",
+            p.out_image_dir / "update" / "partitions" / "vbmeta_disabled.img",
+            p.image_dir / "init_boot_a.img",
+            p.source_dir / "vendor_a" / "etc" / "fstab.rk30board",
+            p.source_dir / "vendor_a" / "etc" / "fstab.rk30board.bak",
+            p.source_dir / "system_a" / "etc" / "recovery.fstab",
+        ]
+        for f in files:
+            f.parent.mkdir(parents=True, exist_ok=True)
+            f.write_text("DUMMY")
+        (p.out_dir / "boot_unpacked" / "boot").mkdir(parents=True)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_matches_finders(self):
+        for mode in ("auto", "A", "B", "both"):
+            self.project.update_config(slot_mode=mode)
+            found = scan_project(self.project)
+            self.assertEqual(found["vbmeta"], scan_vbmeta_targets(self.project), mode)
+        self.assertEqual(found["fstab"], find_fstab_files(self.project))
+        self.assertEqual(set(found["boot"]), set(find_boot_images(self.project)))
+        self.assertEqual([d.name for d in found["boot_unpacked"]], ["boot"])
+
+    def test_rescan_after_change(self):
+        first = scan_project(self.project)
+        self.assertIs(scan_project(self.project), first)  # Không đổi -> cache
+
+        in_dir = self.project.in_dir
+        (in_dir / "vendor_boot.img").write_text("DUMMY")
+        # mtime có thể thô (vài ms) -> đẩy mtime folder lên chắc chắn khác
+        st = os.stat(in_dir)
+        os.utime(in_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        names = {p.name for p in scan_project(self.project)["boot"]}
+        self.assertIn("vendor_boot.img", names)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,6 @@ Verifies BUG P0-1 fix: workspace_root must be saved/loaded correctly
 """
 import unittest
 import tempfile
-import shutil
 import os
 from pathlib import Path
 from unittest.mock import patch
@@ -15,24 +14,31 @@ from app.core import workspace
 class TestSettingsWorkspacePersist(unittest.TestCase):
     
     def setUp(self):
-        # 1. Create temp appdata
-        self.temp_appdata = Path(tempfile.mkdtemp(prefix="rk_test_appdata_"))
+        # 1. Create temp appdata (cleanup qua addCleanup, chạy sau tearDown)
+        tmp = tempfile.TemporaryDirectory(prefix="rk_test_appdata_", ignore_cleanup_errors=True)
+        self.addCleanup(tmp.cleanup)
+        self.temp_appdata = Path(tmp.name)
         
         # 2. Patch env APPDATA
-        self.env_patcher = patch.dict(os.environ, {"APPDATA": str(self.temp_appdata)})
-        self.env_patcher.start()
+        patcher = patch.dict(os.environ, {"APPDATA": str(self.temp_appdata)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings_store.get_appdata_dir.cache_clear()
         
-        # 3. Reset SettingsStore Singleton
+        # 3. Reset SettingsStore Singleton + cached workspace root
         settings_store.SettingsStore._instance = None
+        workspace.get_workspace_root.cache_clear()
         
         # 4. Create temp workspace dir
-        self.temp_ws = Path(tempfile.mkdtemp(prefix="rk_test_ws_"))
+        tmp_ws = tempfile.TemporaryDirectory(prefix="rk_test_ws_", ignore_cleanup_errors=True)
+        self.addCleanup(tmp_ws.cleanup)
+        self.temp_ws = Path(tmp_ws.name)
 
     def tearDown(self):
-        self.env_patcher.stop()
+        # Chạy trước các cleanup của addCleanup (env/temp dirs)
+        settings_store.get_appdata_dir.cache_clear()
         settings_store.SettingsStore._instance = None
-        shutil.rmtree(self.temp_appdata, ignore_errors=True)
-        shutil.rmtree(self.temp_ws, ignore_errors=True)
+        workspace.get_workspace_root.cache_clear()
 
     def test_workspace_root_persist(self):
         """Test set_workspace_root persists to settings.json and survives reload"""
@@ -54,8 +60,9 @@ class TestSettingsWorkspacePersist(unittest.TestCase):
         content = settings_path.read_text(encoding='utf-8')
         self.assertIn(str(self.temp_ws).replace("\\", "\\\\"), content) # Check JSON escaped path
         
-        # Reset Singleton to force reload from disk
+        # Reset Singleton + cache to force reload from disk
         settings_store.SettingsStore._instance = None
+        workspace.get_workspace_root.cache_clear()
         
         # Verify load
         loaded = workspace.get_workspace_root()
@@ -3,54 +3,82 @@ Test Smoke Import Policy
 Verify that smoke_test skips UI imports gracefully when missing, unless strict mode is on.
 """
 import unittest
+import importlib.abc
+import importlib.machinery
 import os
 import sys
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 # Import the function to test
 from app.tests.smoke_test import test_imports
 
+STRICT_ENV = "RK_SMOKE_REQUIRE_UI"
+
+
+class _FailLoader(importlib.abc.Loader):
+    """Loader luôn fail: giả lập UI module có file nhưng thiếu deps (PyQt5)"""
+
+    def create_module(self, spec):
+        raise ImportError(f"{spec.name} blocked (simulated missing UI deps)", name=spec.name)
+
+    def exec_module(self, module):
+        raise ImportError(f"{module.__name__} blocked (simulated missing UI deps)")
+
+
+class _BlockUIFinder(importlib.abc.MetaPathFinder):
+    """meta_path finder: app.ui.* resolve ra spec với _FailLoader"""
+
+    def find_spec(self, name, path=None, target=None):
+        if name.startswith("app.ui."):
+            return importlib.machinery.ModuleSpec(name, _FailLoader())
+        return None
+
+
 class TestSmokeImportPolicy(unittest.TestCase):
-    
-    def setUp(self):
-        # Clean up any existing UI modules from cache to force re-import logic
-        self.ui_modules = [m for m in sys.modules if m.startswith('app.ui')]
-        for m in self.ui_modules:
-            del sys.modules[m]
-
-    def tearDown(self):
-        # Restore (optional, but good practice if feasible. 
-        # Here we just deleted them, reloading happens naturally or valid tests won't care)
-        pass
+
+    @classmethod
+    def setUpClass(cls):
+        # Gỡ app.ui.* đã cache một lần cho cả class, restore ở tearDownClass
+        cls._saved_ui = {m: sys.modules.pop(m) for m in list(sys.modules) if m.startswith("app.ui.")}
+        # Insert đầu meta_path để chạy trước PathFinder (module thật vẫn có trên disk)
+        cls._finder = _BlockUIFinder()
+        sys.meta_path.insert(0, cls._finder)
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.meta_path.remove(cls._finder)
+        sys.modules.update(cls._saved_ui)
+
+    def _set_strict_env(self, value):
+        """Chỉ đổi RK_SMOKE_REQUIRE_UI (không snapshot cả os.environ)"""
+        old = os.environ.get(STRICT_ENV)
+        if value is None:
+            os.environ.pop(STRICT_ENV, None)
+        else:
+            os.environ[STRICT_ENV] = value
+        self.addCleanup(self._restore_env, old)
+
+    @staticmethod
+    def _restore_env(old):
+        if old is None:
+            os.environ.pop(STRICT_ENV, None)
+        else:
+            os.environ[STRICT_ENV] = old
 
     def test_missing_ui_skipped_by_default(self):
         """Default (no env): Missing UI -> Pass (Skip)"""
-        # Clean env but keep system vars, just remove RK_SMOKE_REQUIRE_UI if present
-        new_env = os.environ.copy()
-        if "RK_SMOKE_REQUIRE_UI" in new_env:
-            del new_env["RK_SMOKE_REQUIRE_UI"]
-
-        # Mock import failure for app.ui.main_window
-        with patch.dict(sys.modules, {'app.ui.main_window': None}):
-            with patch.dict(os.environ, new_env, clear=True): 
-                # verify test_imports returns True
-                result = test_imports()
-                self.assertTrue(result, "Should pass (skip) when UI missing by default")
+        self._set_strict_env(None)
+        # Không strict: smoke import UI thật nếu có PyQt5 -> giả lập máy không có PyQt5
+        with patch("app.tests.smoke_test._module_available", return_value=False):
+            result = test_imports()
+        self.assertTrue(result, "Should pass (skip) when UI missing by default")
 
     def test_missing_ui_fails_strict_mode(self):
         """Strict mode (RK_SMOKE_REQUIRE_UI=1): Missing UI -> Fail"""
-        with patch.dict(sys.modules, {'app.ui.main_window': None}):
-            with patch.dict(os.environ, {"RK_SMOKE_REQUIRE_UI": "1"}):
-                # test_imports catches ImportError and returns False/print failure
-                # BUT logic says "raise e" inside the except block?
-                # Wait, my logic in smoke_test.py:
-                # except ImportError as e: if env==1: raise e
-                # Then outer try/except catches it and returns False?
-                # Outer block: except ImportError as e: print... return False
-                
-                # So result should be False.
-                result = test_imports()
-                self.assertFalse(result, "Should fail when strict mode enabled and UI missing")
+        # test_imports re-raise ImportError ở strict mode, outer except -> return False
+        self._set_strict_env("1")
+        result = test_imports()
+        self.assertFalse(result, "Should fail when strict mode enabled and UI missing")
 
 if __name__ == "__main__":
     unittest.main()
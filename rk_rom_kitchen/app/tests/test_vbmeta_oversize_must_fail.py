@@ -3,7 +3,7 @@ Test AVB Patch Oversize Must Fail
 Verify that if patched vbmeta exceeds original size, the process fails hard.
 """
 import unittest
-import shutil
+import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -14,10 +14,8 @@ from app.core.avb_manager import patch_all_vbmeta
 class TestVbmetaOversizeMustFail(unittest.TestCase):
     
     def setUp(self):
-        self.tmp_dir = Path("temp_oversize_test")
-        if self.tmp_dir.exists():
-            shutil.rmtree(self.tmp_dir)
-        self.tmp_dir.mkdir()
+        self._tmp = tempfile.TemporaryDirectory(prefix="rk_test_", ignore_cleanup_errors=True)
+        self.tmp_dir = Path(self._tmp.name)
         
         self.ws = Workspace(self.tmp_dir)
         self.ws.create_project_structure("test_proj")
@@ -27,10 +25,11 @@ class TestVbmetaOversizeMustFail(unittest.TestCase):
         self.target = self.project.in_dir / "vbmeta.img"
         self.target.write_bytes(b"ORIG" * 16) # 64 bytes
         self.target_size = self.target.stat().st_size
+        # Output giả lớn hơn original, build một lần
+        self.oversize_blob = b"X" * (self.target_size + 100)
 
     def tearDown(self):
-        if self.tmp_dir.exists():
-            shutil.rmtree(self.tmp_dir)
+        self._tmp.cleanup()
 
     @patch("app.tools.registry.get_tool_registry")
     @patch("app.core.avb_manager.scan_vbmeta_targets")
@@ -45,7 +44,7 @@ class TestVbmetaOversizeMustFail(unittest.TestCase):
             # args contain --output path
             out_path = Path(args[args.index("--output") + 1])
             # Write larger file
-            out_path.write_bytes(b"X" * (self.target_size + 100))
+            out_path.write_bytes(self.oversize_blob)
             return MagicMock(returncode=0, stderr="")
         mock_run.side_effect = side_effect
         
@@ -57,6 +57,19 @@ class TestWorkspaceMigrate(unittest.TestCase):
         # Implementation: shutil.rmtree(self.src_root / relative)
         self.assertFalse((self.src_root / "tools" / "win64").exists())
 
+    def test_migrate_move_merge_keeps_existing(self):
+        """Mode MOVE into existing Dst: existing files not overwritten, new ones moved"""
+        (self.dst_root / "tools" / "win64").mkdir(parents=True)
+        (self.dst_root / "tools" / "win64" / "tool.exe").write_text("dst")
+        (self.src_root / "tools" / "win64" / "other.exe").write_text("o")
+        
+        workspace.migrate_workspace(self.src_root, self.dst_root, 'MOVE')
+        
+        self.assertEqual((self.dst_root / "tools" / "win64" / "tool.exe").read_text(), "dst")
+        self.assertEqual((self.dst_root / "tools" / "win64" / "other.exe").read_text(), "o")
+        self.assertTrue((self.dst_root / "Projects" / "ProjA" / "config").is_dir())
+        self.assertFalse((self.src_root / "tools" / "win64").exists())
+
     def test_migrate_skip(self):
         """Mode SKIP: Nothing happens"""
         # Create DST partially to ensure no touch
@@ -3,7 +3,7 @@ Test Workspace Required Logic
 Verify that WorkspaceNotConfiguredError is raised and layout is created correctly.
 """
 import unittest
-import shutil
+import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -13,9 +13,8 @@ from app.core.errors import WorkspaceNotConfiguredError
 class TestWorkspaceRequired(unittest.TestCase):
     
     def setUp(self):
-        self.tmp_root = Path("temp_ws_test")
-        if self.tmp_root.exists():
-            shutil.rmtree(self.tmp_root)
+        self._tmp = tempfile.TemporaryDirectory(prefix="rk_test_", ignore_cleanup_errors=True)
+        self.tmp_root = Path(self._tmp.name) / "ws"  # chưa tồn tại, set_workspace_root sẽ tạo
             
         # Mock settings store to return nothing by default
         self.mock_settings = MagicMock()
@@ -24,13 +23,14 @@ class TestWorkspaceRequired(unittest.TestCase):
         self.patcher = patch("app.core.workspace._get_settings", return_value=self.mock_settings)
         self.patcher.start()
         
-        # Reset singleton
+        # Reset singleton + cached root
         workspace._workspace = None
+        workspace.get_workspace_root.cache_clear()
 
     def tearDown(self):
         self.patcher.stop()
-        if self.tmp_root.exists():
-            shutil.rmtree(self.tmp_root)
+        workspace.get_workspace_root.cache_clear()
+        self._tmp.cleanup()
 
     def test_get_root_raises_error_if_empty(self):
         """get_workspace_root raises if setting empty"""
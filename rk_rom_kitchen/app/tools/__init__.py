@@ -1,3 +1,28 @@
 """
 Tools modules cho RK ROM Kitchen
 """
+import importlib.util
+import sys
+
+__all__ = ["registry", "runner", "rockchip", "android_images", "avb", "fs"]
+
+
+def __getattr__(name):
+    """Lazy load submodule khi truy cập lần đầu (PEP 562)"""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    fq_name = f"{__name__}.{name}"
+    # Đã import (hoặc đang lazy) -> dùng lại, tránh thay module trong sys.modules
+    mod = sys.modules.get(fq_name)
+    if mod is None:
+        spec = importlib.util.find_spec(fq_name)
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[fq_name] = mod
+        spec.loader.exec_module(mod)
+    globals()[name] = mod
+    return mod
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,6 +8,8 @@ Stub – Phase 2 sẽ implement logic thật
 - sparse_to_raw(): Gọi simg2img.exe
 - raw_to_sparse(): Gọi img2simg.exe
 """
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -17,6 +19,16 @@ from .runner import get_runner
 from .registry import get_tool_registry
 
 
+@lru_cache(maxsize=None)
+def _log():
+    """LogBus singleton, lấy một lần (lazy để không tạo LogBus lúc import)"""
+    return get_log_bus()
+
+
+# Sparse header magic (uint32 little endian)
+_SPARSE_MAGIC = 0xED26FF3A
+
+
 def unpack_super(super_img: Path,
                  output_dir: Path,
                  slot: str = "a") -> TaskResult:
@@ -29,7 +41,7 @@ def unpack_super(super_img: Path,
         output_dir: Thư mục output
         slot: Slot (a hoặc b) cho A/B devices
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[ANDROID] unpack_super: {super_img}")
     log.info(f"[ANDROID] Slot: {slot}")
     log.warning("[ANDROID] Stub – Phase 2 sẽ implement")
@@ -60,7 +72,7 @@ def pack_super(partitions: List[dict],
         metadata_size: Metadata size
         block_size: Block size
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[ANDROID] pack_super: -> {output_img}")
     log.info(f"[ANDROID] Partitions: {[p.get('name') for p in partitions]}")
     log.warning("[ANDROID] Stub – Phase 2 sẽ implement")
@@ -78,7 +90,7 @@ def sparse_to_raw(sparse_img: Path,
         sparse_img: Input sparse image
         raw_img: Output raw image
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[ANDROID] sparse_to_raw: {sparse_img.name} -> {raw_img.name}")
     log.warning("[ANDROID] Stub – Phase 2 sẽ implement")
     
@@ -97,7 +109,7 @@ def raw_to_sparse(raw_img: Path,
         sparse_img: Output sparse image
         block_size: Block size
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[ANDROID] raw_to_sparse: {raw_img.name} -> {sparse_img.name}")
     log.warning("[ANDROID] Stub – Phase 2 sẽ implement")
     
@@ -107,22 +119,22 @@ def raw_to_sparse(raw_img: Path,
 def is_sparse_image(img_path: Path) -> bool:
     """
     Kiểm tra xem image có phải sparse format không
-    Dựa trên magic number 0x3aff26ed
+    Dựa trên magic number 0xed26ff3a (little endian: 3a ff 26 ed)
     """
-    log = get_log_bus()
-    
-    if not img_path.exists():
-        return False
+    log = _log()
     
+    # Không probe exists(): file thiếu -> OSError -> False
     try:
-        with open(img_path, 'rb') as f:
-            magic = f.read(4)
-        
-        # Sparse image magic: 0xed26ff3a (little endian)
-        is_sparse = magic == b'\xed\x26\xff\x3a'
-        log.debug(f"[ANDROID] {img_path.name} is{''}sparse: {is_sparse}")
-        return is_sparse
-        
-    except Exception as e:
-        log.error(f"[ANDROID] Lỗi đọc file: {e}")
+        fd = os.open(os.fspath(img_path), os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            magic = os.read(fd, 4)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        if not isinstance(e, FileNotFoundError):
+            log.error(f"[ANDROID] Lỗi đọc file: {e}")
         return False
+    
+    is_sparse = len(magic) == 4 and int.from_bytes(magic, 'little') == _SPARSE_MAGIC
+    log.debug(f"[ANDROID] {img_path.name} is sparse: {is_sparse}")
+    return is_sparse
@@ -6,6 +6,7 @@ Stub – Phase 2 sẽ implement logic thật
 - disable_verification(): Patch vbmeta để disable dm-verity và AVB
 - verify_image(): Verify AVB signature của boot/vbmeta image
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -15,6 +16,12 @@ from .runner import get_runner
 from .registry import get_tool_registry
 
 
+@lru_cache(maxsize=None)
+def _log():
+    """LogBus singleton, lấy một lần (lazy để không tạo LogBus lúc import)"""
+    return get_log_bus()
+
+
 def disable_verification(vbmeta_img: Path,
                         output_img: Optional[Path] = None) -> TaskResult:
     """
@@ -25,7 +32,7 @@ def disable_verification(vbmeta_img: Path,
         vbmeta_img: Đường dẫn đến vbmeta.img
         output_img: Output path (nếu None, patch in-place)
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[AVB] disable_verification: {vbmeta_img}")
     log.warning("[AVB] Stub – Phase 2 sẽ implement")
     
@@ -49,7 +56,7 @@ def patch_vbmeta_flags(vbmeta_img: Path,
         2 = Verification disabled
         3 = Both disabled
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[AVB] patch_vbmeta_flags: {vbmeta_img} -> flags={flags}")
     log.warning("[AVB] Stub – Phase 2 sẽ implement")
     
@@ -64,7 +71,7 @@ def verify_image(image_path: Path) -> TaskResult:
     Args:
         image_path: Image để verify (boot.img, vbmeta.img, etc.)
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[AVB] verify_image: {image_path}")
     log.warning("[AVB] Stub – Phase 2 sẽ implement")
     
@@ -82,7 +89,7 @@ def extract_avb_info(image_path: Path) -> dict:
     Returns:
         Dict với AVB info (algorithm, hash, etc.)
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[AVB] extract_avb_info: {image_path}")
     log.warning("[AVB] Stub – Phase 2 sẽ implement")
     
@@ -102,7 +109,7 @@ def make_vbmeta(output_img: Path,
     Stub – Phase 2
     Tạo vbmeta.img mới với flags disabled
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[AVB] make_vbmeta: {output_img}")
     log.warning("[AVB] Stub – Phase 2 sẽ implement")
     
@@ -2,6 +2,7 @@
 Filesystem Utilities - Xử lý filesystem images
 Stub – Phase 2 sẽ implement logic thật
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -9,6 +10,12 @@ from ..core.logbus import get_log_bus
 from ..core.task_defs import TaskResult
 
 
+@lru_cache(maxsize=None)
+def _log():
+    """LogBus singleton, lấy một lần (lazy để không tạo LogBus lúc import)"""
+    return get_log_bus()
+
+
 def mount_ext4(image_path: Path,
                mount_point: Path) -> TaskResult:
     """
@@ -17,7 +24,7 @@ def mount_ext4(image_path: Path,
     
     Note: Trên Windows, có thể cần dùng WSL hoặc 7-zip để extract
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[FS] mount_ext4: {image_path} -> {mount_point}")
     log.warning("[FS] Stub – Phase 2 sẽ implement")
     log.warning("[FS] Trên Windows có thể cần quyền Admin hoặc dùng WSL")
@@ -30,7 +37,7 @@ def unmount(mount_point: Path) -> TaskResult:
     Stub – Phase 2
     Unmount một mount point
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[FS] unmount: {mount_point}")
     log.warning("[FS] Stub – Phase 2 sẽ implement")
     
@@ -44,7 +51,7 @@ def extract_ext4(image_path: Path,
     Extract ext4 image mà không cần mount
     Sử dụng ext4_extractor hoặc 7-zip
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[FS] extract_ext4: {image_path} -> {output_dir}")
     log.warning("[FS] Stub – Phase 2 sẽ implement")
     
@@ -65,7 +72,7 @@ def make_ext4(source_dir: Path,
         partition_size: Partition size (0 = auto)
         label: Volume label
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[FS] make_ext4: {source_dir} -> {output_img}")
     log.warning("[FS] Stub – Phase 2 sẽ implement")
     
@@ -77,7 +84,7 @@ def get_ext4_info(image_path: Path) -> dict:
     Stub – Phase 2
     Lấy thông tin của ext4 image
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[FS] get_ext4_info: {image_path}")
     log.warning("[FS] Stub – Phase 2 sẽ implement")
     
@@ -97,7 +104,7 @@ def list_files_in_image(image_path: Path,
     Stub – Phase 2
     Liệt kê files trong một image mà không cần extract
     """
-    log = get_log_bus()
+    log = _log()
     log.info(f"[FS] list_files_in_image: {image_path}")
     log.warning("[FS] Stub – Phase 2 sẽ implement")
     
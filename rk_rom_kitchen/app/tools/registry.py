@@ -4,14 +4,21 @@ Hỗ trợ alias filenames cho mỗi tool_id
 """
 import os
 import sys
+import stat
 import subprocess
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple, ValuesView
+from dataclasses import dataclass
 
 from ..core.logbus import get_log_bus
 from ..core.settings_store import get_settings_store
 
+# Cờ ẩn console window khi spawn tool (chỉ có trên Windows), tính một lần lúc import
+_CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0) if os.name == 'nt' else 0
+
 
 # Tool definitions với logical tool_id và alias filenames
 TOOL_DEFINITIONS = {
@@ -131,6 +138,95 @@ TOOL_DEFINITIONS = {
 }
 
 
+@dataclass(frozen=True, slots=True)
+class ToolDef:
+    """Definition đã compile của một tool (immutable, attribute access)"""
+    tool_id: str
+    aliases: Tuple[str, ...]
+    description: str = ""
+    version_arg: Optional[str] = None
+    is_python: bool = False
+    required_for: str = ""
+
+
+# Compile TOOL_DEFINITIONS một lần lúc import
+TOOL_DEFS: Dict[str, ToolDef] = {
+    tool_id: ToolDef(
+        tool_id=tool_id,
+        aliases=tuple(defn.get("aliases", ())),
+        description=defn.get("description", ""),
+        version_arg=defn.get("version_arg"),
+        is_python=defn.get("is_python", False),
+        required_for=defn.get("required_for", ""),
+    )
+    for tool_id, defn in TOOL_DEFINITIONS.items()
+}
+
+
+# Reverse index: alias.casefold() -> [(tool_id, thứ tự ưu tiên của alias)]
+ALIAS_TO_TOOL: Dict[str, List[Tuple[str, int]]] = {}
+for _defn in TOOL_DEFS.values():
+    for _idx, _alias in enumerate(_defn.aliases):
+        ALIAS_TO_TOOL.setdefault(_alias.casefold(), []).append((_defn.tool_id, _idx))
+del _defn, _idx, _alias
+
+
+def _match_tools(search_paths: List[Path]) -> Dict[str, Tuple[str, os.DirEntry]]:
+    """
+    Một lượt qua listing mỗi thư mục -> tool_id: (alias, DirEntry).
+    Ưu tiên: search path trước, rồi alias đứng trước trong definition.
+    """
+    best: Dict[str, Tuple[int, int, os.DirEntry]] = {}
+    for rank, search_path in enumerate(search_paths):
+        for name_cf, entry in _scan_dir(search_path).items():
+            for tool_id, idx in ALIAS_TO_TOOL.get(name_cf, ()):
+                cur = best.get(tool_id)
+                if cur is None or (rank, idx) < cur[:2]:
+                    best[tool_id] = (rank, idx, entry)
+    return {
+        tool_id: (TOOL_DEFS[tool_id].aliases[idx], entry)
+        for tool_id, (_, idx, entry) in best.items()
+    }
+
+
+def _off_gui_thread() -> bool:
+    """True nếu đang ở worker thread của một Qt app (CLI/test không có app -> False)"""
+    try:
+        from PyQt5.QtCore import QCoreApplication, QThread
+    except ImportError:
+        return False
+    app = QCoreApplication.instance()
+    return app is not None and QThread.currentThread() != app.thread()
+
+
+@lru_cache(maxsize=256)
+def _is_dir_cached(path_str: str) -> bool:
+    """is_dir bằng một lần os.stat (cache theo string, clear mỗi lần detect_all)"""
+    try:
+        return stat.S_ISDIR(os.stat(path_str).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def _scan_dir(search_path: Path) -> Dict[str, os.DirEntry]:
+    """Map tên file (casefold) -> DirEntry; cache tới khi mtime thư mục đổi"""
+    path_str = os.fspath(search_path)
+    try:
+        mtime_ns = os.stat(path_str).st_mtime_ns
+    except (OSError, ValueError):
+        return {}
+    return _scan_dir_cached(path_str, mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _scan_dir_cached(path_str: str, mtime_ns: int) -> Dict[str, os.DirEntry]:
+    try:
+        with os.scandir(path_str) as it:
+            return {e.name.casefold(): e for e in it if e.is_file()}
+    except OSError:
+        return {}
+
+
 @dataclass
 class ToolInfo:
     """Thông tin về một tool"""
@@ -141,131 +237,290 @@ class ToolInfo:
     available: bool = False
     version: str = ""
     error: str = ""
-    aliases: List[str] = field(default_factory=list)
+    aliases: Tuple[str, ...] = ()
 
 
 class ToolRegistry:
     """
     Registry để quản lý tools using Workspace or App fallback.
+    Dùng get_tool_registry() để lấy singleton.
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
-        
+    def _init(self):
+        # Key theo tool_id.casefold() -> lookup không phân biệt hoa/thường
         self._tools: Dict[str, ToolInfo] = {}
         self._log = get_log_bus()
         self._settings = get_settings_store()
+        # Search paths cache, build lại khi dirty
+        self._search_paths_cache: Optional[List[Path]] = None
+        self._search_paths_dirty = True
+        # Watch search paths khi chạy trong Qt app (None ở CLI/test)
+        self._fs_watcher = None
+        # Detect lazy theo từng tool ở lookup đầu tiên (xem _ensure_tool);
+        # full scan chỉ khi cần cả danh sách (xem _ensure_detected)
+        self._detected: Set[str] = set()  # tool_id.casefold() đã detect
+        self._all_detected = False
+        self._detect_lock = threading.Lock()
+        # Tool bị watcher invalidate, áp dụng ở _apply_stale (dưới _detect_lock).
+        # _stale_lock chỉ giữ lúc đổi set -> GUI thread không chờ version probe
+        self._stale: Set[str] = set()
+        self._stale_lock = threading.Lock()
+        # Version cache: normcase path -> [mtime_ns, size, version] (persist trong settings)
+        self._check_cache: Dict[str, list] = dict(self._settings.get("tool_check_cache") or {})
+        self._check_cache_dirty = False
         
         # Initialize tool info từ definitions
-        for tool_id, defn in TOOL_DEFINITIONS.items():
-            self._tools[tool_id] = ToolInfo(
+        for tool_id, defn in TOOL_DEFS.items():
+            self._tools[tool_id.casefold()] = ToolInfo(
                 tool_id=tool_id,
                 name=tool_id,
-                description=defn.get("description", ""),
-                aliases=defn.get("aliases", []),
+                description=defn.description,
+                aliases=defn.aliases,
             )
-            
-        # AUTO-DETECT ON STARTUP
-        self._log.info("[REGISTRY] Auto-detecting tools...")
-        self.detect_all()
+    
+    def _ensure_detected(self):
+        """Auto-detect tất cả tools một lần (cho các API trả về cả danh sách)"""
+        if self._all_detected and not self._stale:
+            return
+        with self._detect_lock:
+            self._apply_stale()
+            if not self._all_detected:
+                self._log.info("[REGISTRY] Auto-detecting tools...")
+                self.detect_all()
+                self._all_detected = True
+    
+    def _ensure_tool(self, tool_id: str) -> Optional[ToolInfo]:
+        """Detect riêng tool_id ở lookup đầu tiên, không probe các tool khác"""
+        key = tool_id.casefold()
+        if self._stale or (key not in self._detected and key in self._tools):
+            with self._detect_lock:
+                self._apply_stale()
+                if key not in self._detected and key in self._tools:
+                    self._detect_tool(self._tools[key].tool_id)
+        return self._tools.get(key)
+    
+    def _apply_stale(self):
+        """Bỏ các tool watcher đã invalidate khỏi _detected (gọi khi giữ _detect_lock)"""
+        with self._stale_lock:
+            stale, self._stale = self._stale, set()
+        if stale:
+            self._detected -= stale
+            self._all_detected = False
+    
+    def _detect_tool(self, tool_id: str) -> ToolInfo:
+        """Detect một tool trên listing đã cache (_scan_dir) + version probe nếu có"""
+        defn = TOOL_DEFS[tool_id]
+        info = None
+        # Cùng thứ tự ưu tiên với _match_tools: search path trước, rồi alias
+        for search_path in self._get_search_paths():
+            listing = _scan_dir(search_path)
+            for alias in defn.aliases:
+                entry = listing.get(alias.casefold())
+                if entry is not None:
+                    info = self._found_info(tool_id, alias, Path(entry.path))
+                    break
+            if info:
+                break
+        
+        if info is None:
+            info = self._missing_info(tool_id)
+        elif defn.version_arg:
+            # Chỉ đánh dấu dirty: lookup có thể chạy trên worker thread,
+            # save thật ở detect_all / save_check_cache (GUI thread)
+            info.version = self._get_version_cached(info.path, defn.version_arg, defn.is_python)
+        
+        self._tools[tool_id.casefold()] = info
+        self._detected.add(tool_id.casefold())
+        return info
+    
+    def save_check_cache(self):
+        """
+        Ghi version cache vào settings nếu có thay đổi.
+        Bỏ qua khi ở worker thread của Qt app: SettingsStore.save không có lock,
+        ghi song song với GUI thread có thể làm hỏng settings.json (giữ dirty, lần sau ghi)
+        """
+        if self._check_cache_dirty and not _off_gui_thread():
+            self._check_cache_dirty = False
+            # Snapshot: _check_cache còn bị detect_all (thread pool) ghi tiếp
+            self._settings.set("tool_check_cache", dict(self._check_cache))
     
     def _get_search_paths(self) -> List[Path]:
         """Lấy danh sách paths để search tools
         Search order:
         1. Workspace tools (Primary): <workspace>/tools/win64
         2. App tools (Fallback/Dev): <app>/tools/win64
+        Kết quả được cache tới khi invalidate_search_paths().
         """
-        paths = []
+        if not self._search_paths_dirty and self._search_paths_cache is not None:
+            return self._search_paths_cache
+        
+        raw = []
         
         # 1. Primary: Workspace
         try:
             from ..core.workspace import get_workspace
             ws = get_workspace()
-            if ws and ws.tools_dir.is_dir():
-                paths.append(ws.tools_dir)
+            if ws:
+                raw.append(os.fspath(ws.tools_dir))
         except Exception:
             pass # Workspace maybe not configured yet
             
         # 2. Fallback: App dir (relative to this file)
         # rk_rom_kitchen/app/tools/registry.py -> rk_rom_kitchen/tools/win64
-        app_root = Path(__file__).parent.parent.parent
-        bundled_dir = app_root / 'tools' / 'win64'
-        if bundled_dir.is_dir():
-            paths.append(bundled_dir)
-            
+        app_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        raw.append(os.path.join(app_root, 'tools', 'win64'))
+        
+        # Dedupe theo normcase (workspace có thể trùng app dir), giữ thứ tự ưu tiên
+        unique = {}
+        for p in raw:
+            unique.setdefault(os.path.normcase(os.path.normpath(p)), p)
+        paths = [Path(p) for p in unique.values() if _is_dir_cached(p)]
+        
+        self._search_paths_cache = paths
+        self._search_paths_dirty = False
+        self._watch_search_paths(paths)
         return paths
     
-    def detect_all(self) -> Dict[str, ToolInfo]:
+    def _watch_search_paths(self, paths: List[Path]):
+        """QFileSystemWatcher trên search paths (chỉ khi có Qt app và ở GUI thread)"""
+        try:
+            from PyQt5.QtCore import QCoreApplication, QFileSystemWatcher, QThread
+        except ImportError:
+            return  # CLI mode / không có PyQt5
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() != app.thread():
+            return  # Worker thread không có event loop -> để GUI thread setup
+        
+        if self._fs_watcher is None:
+            self._fs_watcher = QFileSystemWatcher()
+            self._fs_watcher.directoryChanged.connect(self._on_search_dir_changed)
+        wanted = [os.fspath(p) for p in paths]
+        watched = self._fs_watcher.directories()
+        stale = [d for d in watched if d not in wanted]
+        if stale:
+            self._fs_watcher.removePaths(stale)
+        added = [d for d in wanted if d not in watched]
+        if added:
+            self._fs_watcher.addPaths(added)
+    
+    def _on_search_dir_changed(self, path: str):
+        """
+        Thư mục tools đổi (copy/xóa tool) -> invalidate cache, các tool bị ảnh hưởng
+        sẽ detect lại ở lookup kế tiếp. Listing trong _scan_dir key theo mtime
+        nên tự build lại cho riêng thư mục này.
+        Chạy trên GUI thread: không lấy _detect_lock (worker có thể đang giữ nó
+        trong lúc version probe tới 5s), chỉ ghi lại tool stale cho _apply_stale.
+        """
+        ranks = [os.path.normcase(os.path.normpath(p)) for p in (self._search_paths_cache or [])]
+        changed = os.path.normcase(os.path.normpath(path))
+        rank = ranks.index(changed) if changed in ranks else 0
+        _is_dir_cached.cache_clear()
+        self.invalidate_search_paths()
+        
+        stale = set()
+        # Tool tìm thấy ở thư mục ưu tiên cao hơn không bị ảnh hưởng
+        for key, info in list(self._tools.items()):
+            if info.available:
+                tool_dir = os.path.normcase(os.path.dirname(os.fspath(info.path)))
+                if tool_dir in ranks and ranks.index(tool_dir) < rank:
+                    continue
+            stale.add(key)
+        with self._stale_lock:
+            self._stale |= stale
+        self._log.debug(f"[REGISTRY] Tools dir changed: {path}")
+    
+    def invalidate_search_paths(self):
+        """Đánh dấu search paths cần build lại (vd: đổi workspace)"""
+        self._search_paths_dirty = True
+    
+    def detect_all(self) -> Mapping[str, ToolInfo]:
         """
-        Detect tất cả tools
-        Returns: Dict mapping tool_id -> ToolInfo
+        Detect tất cả tools (full scan, vd: run_doctor / Settings)
+        Returns: mapping read-only (live) tool_id.casefold() -> ToolInfo;
+        cần snapshot thì dict(...)
         """
-        search_paths = self._get_search_paths()
+        # Probe mới cho mỗi lần detect (tools có thể vừa được copy vào);
+        # invalidate từ watcher trước thời điểm này đã được full scan bao luôn
+        with self._stale_lock:
+            self._stale.clear()
+        _is_dir_cached.cache_clear()
+        self.invalidate_search_paths()
+        # Bỏ qua thư mục không có file nào khớp alias (listing đã cache trong _scan_dir)
+        search_paths = [p for p in self._get_search_paths()
+                        if not ALIAS_TO_TOOL.keys().isdisjoint(_scan_dir(p))]
+        matches = _match_tools(search_paths)
         
-        for tool_id, defn in TOOL_DEFINITIONS.items():
-            aliases = defn.get("aliases", [])
-            version_arg = defn.get("version_arg")
-            is_python = defn.get("is_python", False)
+        # Detect path trước, version probe (subprocess) gom lại chạy song song
+        probes = []
+        for tool_id, defn in TOOL_DEFS.items():
             
-            self._tools[tool_id] = self._detect_tool(
-                tool_id, aliases, search_paths, version_arg, is_python
-            )
+            hit = matches.get(tool_id)
+            if hit:
+                info = self._found_info(tool_id, hit[0], Path(hit[1].path))
+            else:
+                info = self._missing_info(tool_id)
+            self._tools[tool_id.casefold()] = info
+            if info.available and defn.version_arg:
+                probes.append((info, defn.version_arg, defn.is_python))
         
-        # Summary
-        available = sum(1 for t in self._tools.values() if t.available)
-        total = len(self._tools)
-        # self._log.info(f"[REGISTRY] Found {available}/{total} tools")
+        if probes:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(8, len(probes))) as pool:
+                versions = pool.map(
+                    lambda p: self._get_version_cached(p[0].path, p[1], p[2]), probes
+                )
+                for (info, _, _), version in zip(probes, versions):
+                    info.version = version
         
-        return self._tools.copy()
-    
-    def _detect_tool(
-        self, 
-        tool_id: str, 
-        aliases: List[str], 
-        search_paths: List[Path],
-        version_arg: Optional[str] = None,
-        is_python: bool = False
-    ) -> ToolInfo:
-        """Detect một tool với alias resolution"""
-        for search_path in search_paths:
-            for alias in aliases:
-                tool_path = search_path / alias
-                if tool_path.exists() and tool_path.is_file():
-                    # Found! Try to get version
-                    version = ""
-                    if version_arg:
-                        version = self._get_version(tool_path, version_arg, is_python)
-                    
-                    return ToolInfo(
-                        tool_id=tool_id,
-                        name=alias,
-                        description=TOOL_DEFINITIONS[tool_id].get("description", ""),
-                        path=tool_path,
-                        available=True,
-                        version=version,
-                        aliases=aliases,
-                    )
+        self.save_check_cache()
+        self._detected.update(self._tools)
+        self._all_detected = True
         
-        # Not found
+        return MappingProxyType(self._tools)
+    
+    @staticmethod
+    def _found_info(tool_id: str, alias: str, tool_path: Path, version: str = "") -> ToolInfo:
+        defn = TOOL_DEFS[tool_id]
+        return ToolInfo(
+            tool_id=tool_id,
+            name=alias,
+            description=defn.description,
+            path=tool_path,
+            available=True,
+            version=version,
+            aliases=defn.aliases,
+        )
+    
+    @staticmethod
+    def _missing_info(tool_id: str) -> ToolInfo:
+        defn = TOOL_DEFS[tool_id]
         return ToolInfo(
             tool_id=tool_id,
             name=tool_id,
-            description=TOOL_DEFINITIONS[tool_id].get("description", ""),
+            description=defn.description,
             available=False,
             error="Not found",
-            aliases=aliases,
+            aliases=defn.aliases,
         )
     
+    def _get_version_cached(self, tool_path: Path, version_arg: str, is_python: bool = False) -> str:
+        """_get_version nhưng bỏ qua subprocess nếu binary không đổi (mtime, size)"""
+        try:
+            st = os.stat(tool_path)
+        except OSError:
+            return ""
+        key = os.path.normcase(os.fspath(tool_path))
+        hit = self._check_cache.get(key)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        
+        version = self._get_version(tool_path, version_arg, is_python)
+        # "" = probe lỗi/timeout (vd: Defender scan lần đầu) -> không cache, lần sau probe lại
+        if version:
+            self._check_cache[key] = [st.st_mtime_ns, st.st_size, version]
+            self._check_cache_dirty = True
+        return version
+    
     def _get_version(self, tool_path: Path, version_arg: str, is_python: bool = False) -> str:
         """Try to get tool version"""
         try:
@@ -280,7 +535,7 @@ class ToolRegistry:
                 capture_output=True,
                 text=True,
                 timeout=5,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+                creationflags=_CREATE_NO_WINDOW
             )
             output = result.stdout.strip() or result.stderr.strip()
             # Extract first line
@@ -289,31 +544,34 @@ class ToolRegistry:
             return ""
     
     def get_tool(self, tool_id: str) -> Optional[ToolInfo]:
-        """Lấy tool info by tool_id"""
-        return self._tools.get(tool_id)
+        """Lấy tool info by tool_id (không phân biệt hoa/thường)"""
+        return self._ensure_tool(tool_id)
     
     def get_tool_path(self, tool_id: str) -> Optional[Path]:
         """Lấy path của tool, None nếu không available"""
-        tool = self._tools.get(tool_id)
+        tool = self._ensure_tool(tool_id)
         if tool and tool.available:
             return tool.path
         return None
     
     def is_available(self, tool_id: str) -> bool:
         """Check tool có available không"""
-        tool = self._tools.get(tool_id)
+        tool = self._ensure_tool(tool_id)
         return tool.available if tool else False
     
-    def get_all_tools(self) -> List[ToolInfo]:
-        """Lấy list tất cả tools"""
-        return list(self._tools.values())
+    def get_all_tools(self) -> ValuesView[ToolInfo]:
+        """Lấy tất cả tools (view live, không copy)"""
+        self._ensure_detected()
+        return self._tools.values()
     
     def get_missing_tools(self) -> List[str]:
         """Lấy list tools đang thiếu"""
+        self._ensure_detected()
         return [t.tool_id for t in self._tools.values() if not t.available]
     
     def get_available_tools(self) -> List[str]:
         """Lấy list tools có sẵn"""
+        self._ensure_detected()
         return [t.tool_id for t in self._tools.values() if t.available]
     
     def run_doctor(self) -> str:
@@ -340,7 +598,7 @@ class ToolRegistry:
         lines.append("-" * 50)
         
         available_count = 0
-        for tool_id, info in sorted(self._tools.items()):
+        for _, info in sorted(self._tools.items()):
             if info.available:
                 status = f"[OK] {info.path}"
                 if info.version:
@@ -348,7 +606,7 @@ class ToolRegistry:
                 available_count += 1
             else:
                 status = "[MISSING]"
-            lines.append(f"  {tool_id:20} {status}")
+            lines.append(f"  {info.tool_id:20} {status}")
         
         lines.append("")
         lines.append("-" * 50)
@@ -377,14 +635,14 @@ class ToolRegistry:
                 lines.append("")
                 lines.append("Required Missing (bắt buộc - download và đặt vào tools/win64/):")
                 for t in required_missing:
-                    aliases = TOOL_DEFINITIONS.get(t, {}).get("aliases", [])
+                    aliases = TOOL_DEFS[t].aliases
                     lines.append(f"  - {t}: {', '.join(aliases[:2])}")
             
             if optional_missing:
                 lines.append("")
                 lines.append("Optional Missing (không bắt buộc):")
                 for t in optional_missing:
-                    aliases = TOOL_DEFINITIONS.get(t, {}).get("aliases", [])
+                    aliases = TOOL_DEFS[t].aliases
                     note = ""
                     if t == "debugfs":
                         note = " (ext4 extraction sẽ bị giới hạn)"
@@ -397,9 +655,22 @@ class ToolRegistry:
         return "\n".join(lines)
 
 
+_REGISTRY: Optional[ToolRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
 def get_tool_registry() -> ToolRegistry:
-    """Lấy singleton ToolRegistry"""
-    return ToolRegistry()
+    """Lấy singleton ToolRegistry (detect tools lazy ở lookup đầu tiên)"""
+    global _REGISTRY
+    r = _REGISTRY
+    if r is None:
+        with _REGISTRY_LOCK:
+            r = _REGISTRY
+            if r is None:
+                r = ToolRegistry.__new__(ToolRegistry)
+                r._init()
+                _REGISTRY = r
+    return r
 
 
 # CLI interface for Tools Doctor
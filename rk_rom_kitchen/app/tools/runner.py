@@ -2,6 +2,9 @@
 CLI Runner - Wrapper để chạy external tools qua subprocess
 Tất cả CLI commands PHẢI đi qua module này
 """
+import codecs
+import os
+import selectors
 import subprocess
 import threading
 import time
@@ -27,6 +30,190 @@ class RunResult:
         return self.returncode == 0 and not self.timed_out
 
 
+class _LogBatcher:
+    """
+    Gom output lines, emit một lần mỗi BATCH_LINES lines hoặc BATCH_SECONDS.
+    Pump gọi flush_stale() khi idle để line đã buffer không nằm chờ line kế tiếp.
+    Thread-safe: reader threads (Windows) add, thread chạy pump flush.
+    """
+    
+    BATCH_LINES = 64
+    BATCH_SECONDS = 0.05
+    
+    __slots__ = ('_emit', '_prefix', '_buf', '_last', '_lock')
+    
+    def __init__(self, emit: Callable[[str], None], prefix: str):
+        self._emit = emit
+        self._prefix = prefix
+        self._buf: List[str] = []
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def add(self, line: str):
+        with self._lock:
+            self._buf.append(line)
+            if (len(self._buf) >= self.BATCH_LINES
+                    or time.monotonic() - self._last > self.BATCH_SECONDS):
+                self._flush()
+    
+    def flush(self):
+        with self._lock:
+            self._flush()
+    
+    def flush_stale(self):
+        """Flush nếu có line đã chờ quá BATCH_SECONDS"""
+        with self._lock:
+            if self._buf and time.monotonic() - self._last > self.BATCH_SECONDS:
+                self._flush()
+    
+    def _flush(self):
+        if self._buf:
+            self._emit(self._prefix + f"\n{self._prefix}".join(self._buf))
+            self._buf.clear()
+        self._last = time.monotonic()
+
+
+# Cờ ẩn console window khi spawn tool (chỉ có trên Windows), tính một lần lúc import
+_CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0) if os.name == 'nt' else 0
+
+# selectors chỉ wait được trên pipe ở POSIX; Windows select() chỉ nhận socket
+_SELECT_PIPES = os.name != 'nt'
+
+# Timeout mỗi lần select khi idle (seconds), tăng dần
+_POLL_STEPS = (0.05, 0.1, 0.2)
+
+
+def _clean_output(text: str) -> str:
+    """Universal newlines, rstrip từng line và bỏ line rỗng (format của RunResult)"""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(filter(None, map(str.rstrip, lines)))
+
+
+def _pump_select(process: subprocess.Popen, timeout: float,
+                 handle_stdout: Optional[Callable[[str], None]],
+                 handle_stderr: Optional[Callable[[str], None]],
+                 on_idle: Optional[Callable[[], None]] = None) -> Tuple[bool, str, str]:
+    """
+    Đọc stdout/stderr trên thread hiện tại bằng selectors (POSIX).
+    Raw bytes gom vào một bytearray mỗi stream, decode một lần ở cuối;
+    handler (nếu có) nhận từng line cho streaming. on_idle được gọi mỗi lần
+    select hết timeout mà không có output.
+    Returns: (timed_out, stdout, stderr) - timed_out=True nếu process đã bị kill
+    """
+    deadline = time.monotonic() + timeout
+    timed_out = False
+    # fd -> [handler, decoder, phần line chưa có newline, raw buffer]
+    streams = {}
+    with selectors.DefaultSelector() as sel:
+        for pipe, handler in ((process.stdout, handle_stdout), (process.stderr, handle_stderr)):
+            sel.register(pipe, selectors.EVENT_READ)
+            decoder = codecs.getincrementaldecoder('utf-8')('replace') if handler else None
+            streams[pipe.fileno()] = [handler, decoder, '', bytearray()]
+        
+        idle = 0
+        exited = False
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                process.kill()
+                timed_out = True
+                break
+            # Stepped backoff khi không có output: 50ms -> 100ms -> 200ms
+            if exited:
+                step = 0  # Chỉ drain phần data còn lại trong pipe
+            else:
+                step = _POLL_STEPS[0] if idle < 4 else _POLL_STEPS[1] if idle < 20 else _POLL_STEPS[2]
+            ready = sel.select(min(remaining, step))
+            if not ready:
+                if exited:
+                    break  # Đã drain xong (pipe có thể bị process con giữ mở)
+                if on_idle:
+                    on_idle()
+                idle += 1
+                exited = process.poll() is not None
+                continue
+            idle = 0
+            for key, _ in ready:
+                state = streams[key.fd]
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    sel.unregister(key.fileobj)
+                    continue
+                state[3] += chunk
+                if state[0] is None:
+                    continue  # Không cần streaming -> chỉ buffer
+                # Universal newlines như text mode (\r\n, \r -> \n)
+                text = state[1].decode(chunk).replace('\r\n', '\n').replace('\r', '\n')
+                lines = (state[2] + text).split('\n')
+                state[2] = lines.pop()
+                for line in lines:
+                    state[0](line)
+    
+    # Phần line cuối không có newline
+    for handler, decoder, pending, _ in streams.values():
+        if handler:
+            tail = pending + decoder.decode(b'', final=True)
+            if tail:
+                handler(tail)
+    
+    process.stdout.close()
+    process.stderr.close()
+    if timed_out:
+        process.wait()
+    else:
+        try:
+            process.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            timed_out = True
+    out_buf, err_buf = (state[3] for state in streams.values())
+    return timed_out, out_buf.decode('utf-8', 'replace'), err_buf.decode('utf-8', 'replace')
+
+
+def _pump_threads(process: subprocess.Popen, timeout: float,
+                  handle_stdout: Optional[Callable[[str], None]],
+                  handle_stderr: Optional[Callable[[str], None]],
+                  on_idle: Optional[Callable[[], None]] = None) -> Tuple[bool, str, str]:
+    """
+    Đọc stdout/stderr bằng 2 reader threads (Windows).
+    Thread gọi chờ process theo nhịp _POLL_STEPS[0] và gọi on_idle mỗi nhịp.
+    Returns: (timed_out, stdout, stderr) - timed_out=True nếu process đã bị kill
+    """
+    outputs = ([], [])
+    
+    def reader(pipe, handler, parts):
+        for line in iter(pipe.readline, ''):
+            parts.append(line)
+            if handler:
+                handler(line)
+    
+    threads = [threading.Thread(target=reader, args=(process.stdout, handle_stdout, outputs[0])),
+               threading.Thread(target=reader, args=(process.stderr, handle_stderr, outputs[1]))]
+    for t in threads:
+        t.start()
+    
+    # Wait for process with timeout
+    deadline = time.monotonic() + timeout
+    timed_out = False
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            process.wait(timeout=max(min(remaining, _POLL_STEPS[0]), 0))
+            break
+        except subprocess.TimeoutExpired:
+            if remaining <= _POLL_STEPS[0]:
+                process.kill()
+                timed_out = True
+                break
+            if on_idle:
+                on_idle()
+    
+    for t in threads:
+        t.join(timeout=2)
+    return timed_out, ''.join(outputs[0]), ''.join(outputs[1])
+
+
 class ToolRunner:
     """
     Runner để execute external CLI tools
@@ -62,8 +249,6 @@ class ToolRunner:
             self._log.debug(f"[RUNNER] CWD: {cwd}")
         
         start_time = time.time()
-        stdout_lines = []
-        stderr_lines = []
         timed_out = False
         
         try:
@@ -72,54 +257,56 @@ class ToolRunner:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 cwd=str(cwd) if cwd else None,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                # select path đọc raw bytes (decode ở pump), thread path dùng text mode
+                text=not _SELECT_PIPES,
+                encoding=None if _SELECT_PIPES else 'utf-8',
+                errors=None if _SELECT_PIPES else 'replace',
+                creationflags=_CREATE_NO_WINDOW
             )
             
-            # Thread để đọc stdout
-            def read_stdout():
-                for line in iter(process.stdout.readline, ''):
-                    line = line.rstrip()
-                    if line:
-                        stdout_lines.append(line)
-                        if log_output:
-                            self._log.debug(f"[OUT] {line}")
-                        if on_output:
-                            on_output(line)
+            # Log theo batch thay vì mỗi line một lần emit
+            out_log = _LogBatcher(self._log.debug, "[OUT] ") if log_output else None
+            err_log = _LogBatcher(self._log.warning, "[ERR] ") if log_output else None
+            
+            # Handler chỉ dùng cho streaming (log/on_output); output đầy đủ lấy từ buffer của pump
+            def handle_stdout(line: str):
+                line = line.rstrip()
+                if line:
+                    if out_log:
+                        out_log.add(line)
+                    if on_output:
+                        on_output(line)
             
-            # Thread để đọc stderr
-            def read_stderr():
-                for line in iter(process.stderr.readline, ''):
-                    line = line.rstrip()
-                    if line:
-                        stderr_lines.append(line)
-                        if log_output:
-                            self._log.warning(f"[ERR] {line}")
+            def handle_stderr(line: str):
+                line = line.rstrip()
+                if line:
+                    err_log.add(line)
             
-            stdout_thread = threading.Thread(target=read_stdout)
-            stderr_thread = threading.Thread(target=read_stderr)
-            stdout_thread.start()
-            stderr_thread.start()
+            def flush_stale():
+                out_log.flush_stale()
+                err_log.flush_stale()
             
-            # Wait for process with timeout
+            pump = _pump_select if _SELECT_PIPES else _pump_threads
             try:
-                process.wait(timeout=timeout)
-            except subprocess.TimeoutExpired:
+                timed_out, stdout, stderr = pump(
+                    process, timeout,
+                    handle_stdout if (log_output or on_output) else None,
+                    handle_stderr if log_output else None,
+                    flush_stale if log_output else None
+                )
+            finally:
+                if log_output:
+                    out_log.flush()
+                    err_log.flush()
+            if timed_out:
                 self._log.error(f"[RUNNER] Timeout after {timeout}s")
-                process.kill()
-                timed_out = True
-            
-            stdout_thread.join(timeout=2)
-            stderr_thread.join(timeout=2)
             
             elapsed_ms = int((time.time() - start_time) * 1000)
             
             result = RunResult(
                 returncode=process.returncode if not timed_out else -1,
-                stdout='\n'.join(stdout_lines),
-                stderr='\n'.join(stderr_lines),
+                stdout=_clean_output(stdout),
+                stderr=_clean_output(stderr),
                 elapsed_ms=elapsed_ms,
                 timed_out=timed_out
             )
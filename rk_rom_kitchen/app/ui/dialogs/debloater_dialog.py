@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
     QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QAbstractItemView
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 from ...core.project_store import get_project_store
 from ...core.logbus import get_log_bus
@@ -21,6 +21,7 @@ class DebloaterDialog(QDialog):
         self._log = get_log_bus()
         self._apks = []
         self._filtered_apks = []
+        self._search_keys = []  # "filename\0partition" lowercase, song song với _apks
         self.setWindowTitle("Debloater")
         self.setMinimumSize(800, 500)
         self._setup_ui()
@@ -51,18 +52,23 @@ class DebloaterDialog(QDialog):
         search_layout = QHBoxLayout()
         self._search_input = QLineEdit()
         self._search_input.setPlaceholderText("Search...")
-        self._search_input.textChanged.connect(self._on_search)
+        # Debounce: gõ liên tục chỉ filter một lần sau 150ms
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(lambda: self._on_search(self._search_input.text()))
+        self._search_input.textChanged.connect(lambda _text: self._search_timer.start())
         search_layout.addWidget(self._search_input)
         layout.addLayout(search_layout)
         
         # Actions
         action_layout = QHBoxLayout()
         self._btn_select_all = QPushButton("Select All")
-        self._btn_select_all.clicked.connect(lambda: self._table.selectAll())
+        self._btn_select_all.clicked.connect(self._table.selectAll)
         action_layout.addWidget(self._btn_select_all)
         
         self._btn_deselect = QPushButton("Deselect")
-        self._btn_deselect.clicked.connect(lambda: self._table.clearSelection())
+        self._btn_deselect.clicked.connect(self._table.clearSelection)
         action_layout.addWidget(self._btn_deselect)
         
         action_layout.addStretch()
@@ -82,25 +88,39 @@ class DebloaterDialog(QDialog):
         
         self._log.info("[DEBLOAT] Scanning APKs...")
         self._apks = scan_apks(project)
+        self._search_keys = [f"{a.filename}\0{a.partition}".lower() for a in self._apks]
         self._filtered_apks = self._apks[:]
         self._update_table()
         self._info_label.setText(f"Loaded {len(self._apks)} APKs")
     
     def _update_table(self):
-        self._table.setRowCount(len(self._filtered_apks))
-        for i, apk in enumerate(self._filtered_apks):
-            self._table.setItem(i, 0, QTableWidgetItem(apk.filename))
-            self._table.setItem(i, 1, QTableWidgetItem(apk.package_name))
-            self._table.setItem(i, 2, QTableWidgetItem(apk.internal_name))
-            self._table.setItem(i, 3, QTableWidgetItem(apk.size_str))
-            self._table.setItem(i, 4, QTableWidgetItem(apk.partition))
+        table = self._table
+        # Tắt repaint/signals/sort trong lúc fill, repaint một lần ở cuối
+        sorting = table.isSortingEnabled()
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        table.setSortingEnabled(False)
+        try:
+            table.setRowCount(len(self._filtered_apks))
+            for i, apk in enumerate(self._filtered_apks):
+                table.setItem(i, 0, QTableWidgetItem(apk.filename))
+                table.setItem(i, 1, QTableWidgetItem(apk.package_name))
+                table.setItem(i, 2, QTableWidgetItem(apk.internal_name))
+                table.setItem(i, 3, QTableWidgetItem(apk.size_str))
+                table.setItem(i, 4, QTableWidgetItem(apk.partition))
+        finally:
+            table.setSortingEnabled(sorting)
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+            table.viewport().update()
     
     def _on_search(self, text):
         text = text.lower()
         if not text:
             self._filtered_apks = self._apks[:]
         else:
-            self._filtered_apks = [a for a in self._apks if text in a.filename.lower() or text in a.partition.lower()]
+            apks = self._apks
+            self._filtered_apks = [apks[i] for i, key in enumerate(self._search_keys) if text in key]
         self._update_table()
     
     def _on_delete(self):
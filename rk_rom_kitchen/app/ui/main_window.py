@@ -3,11 +3,14 @@ Main Window - Cửa sổ chính của ứng dụng
 Layout giống CRB: Icon sidebar trái, Project sidebar, Main canvas, Log panel dưới
 """
 import os
+import html
+import subprocess
+from functools import partial
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
     QStackedWidget, QSplitter, QLabel, QMessageBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 from ..i18n import t, get_language
 from ..core.app_context import get_app_context
@@ -40,27 +43,22 @@ class AboutPage(QWidget):
         
         from .. import __version__
         
-        title = QLabel("RK ROM Kitchen")
-        title.setStyleSheet("font-size: 24px; font-weight: bold;")
-        layout.addWidget(title)
-        
-        version = QLabel(f"Version {__version__}")
-        layout.addWidget(version)
-        
-        desc = QLabel(t("about_description"))
-        desc.setStyleSheet("color: #969696;")
-        layout.addWidget(desc)
-        
-        layout.addSpacing(20)
-        
-        info = QLabel(
-            "Công cụ mod ROM dành riêng cho thiết bị Rockchip.\n\n"
-            "Hỗ trợ: update.img, release_update.img, super.img\n\n"
-            "© 2024 RK Kitchen Team"
+        # Một QLabel rich text thay cho 4 label riêng: một lần layout/paint
+        desc = html.escape(t("about_description")).replace("\n", "<br>")
+        label = QLabel(
+            '<div align="center">'
+            '<p style="font-size: 24px; font-weight: bold;">RK ROM Kitchen</p>'
+            f'<p>Version {__version__}</p>'
+            f'<p style="color: #969696;">{desc}</p>'
+            '<p style="color: #808080; margin-top: 20px;">'
+            'Công cụ mod ROM dành riêng cho thiết bị Rockchip.<br><br>'
+            'Hỗ trợ: update.img, release_update.img, super.img<br><br>'
+            '© 2024 RK Kitchen Team'
+            '</p></div>'
         )
-        info.setAlignment(Qt.AlignCenter)
-        info.setStyleSheet("color: #808080;")
-        layout.addWidget(info)
+        label.setTextFormat(Qt.RichText)
+        label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(label)
     
     def update_translations(self):
         pass
@@ -101,21 +99,58 @@ class MainWindow(QMainWindow):
     Main application window
     """
     
+    # Pages hay dùng, tạo sẵn lúc idle sau khi window hiện
+    PRELOAD_PAGES = ("extractor", "patches", "build")
+    
+    # Sidebar folder actions: action_id -> thuộc tính Project
+    _FOLDER_ATTRS = {
+        "open_rom": "in_dir",
+        "open_build": "out_dir",
+        "open_source": "source_dir",
+        "open_output": "out_dir",
+        "open_config": "config_dir",
+        "open_log": "logs_dir",
+    }
+    
+    # Sidebar actions chưa implement
+    _COMING_SOON_ACTIONS = (
+        "build_bulk", "build_super", "make_vbmeta_disabled",
+        "force_encryption", "boot_editor", "patch_boot",
+    )
+    
     def __init__(self):
         super().__init__()
         self._ctx = get_app_context()
         self._log = get_log_bus()
         self._settings = get_settings_store()
-        
-        self._pages: dict = {}
+        self._os_is_nt = os.name == 'nt'
+        
+        self._pages: dict = {}      # page_id -> PageClass (chưa khởi tạo)
+        self._instances: dict = {}  # page_id -> widget đã tạo
+        self._refreshable: dict = {}  # page_id -> bound refresh (None nếu page không có)
+        self._page_index: dict = {}   # page_id -> index trong _page_stack (chỉ append, không remove)
+        self._preload_queue: list = []
+        self._current_page_id = ""
+        
+        # Gom các refresh trong cùng một tick event loop thành một lần
+        self._refresh_pending: set = set()
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._flush_refresh)
         
         self._setup_window()
         self._setup_ui()
+        self._build_action_handlers()
         self._connect_signals()
         
         # Initial page
         self._on_page_changed("project")
         
+        # Warm các page hay dùng lúc idle, mỗi tick một page
+        self._preload_queue = [p for p in self.PRELOAD_PAGES if p in self._pages]
+        QTimer.singleShot(0, self._preload_next)
+        
         # Log startup
         self._log.info("RK ROM Kitchen đã khởi động")
         self._log.info(f"Workspace: {self._ctx.workspace.root}")
@@ -183,7 +218,7 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self._status_panel)
     
     def _create_pages(self):
-        """Create and add all pages"""
+        """Đăng ký pages; widget chỉ được tạo ở lần đầu mở (xem _get_page)"""
         pages = [
             ("project", PageProject),
             ("folders", PageFolders),
@@ -199,10 +234,39 @@ class MainWindow(QMainWindow):
             ("boot_unpack", PageBootUnpack),
         ]
         
-        for page_id, PageClass in pages:
-            page = PageClass()
-            self._pages[page_id] = page
-            self._page_stack.addWidget(page)
+        self._pages.update(pages)
+    
+    def _get_page(self, page_id: str) -> QWidget:
+        """Lấy page widget, khởi tạo + add vào stack ở lần đầu"""
+        page = self._instances.get(page_id)
+        if page is None:
+            page = self._pages[page_id]()
+            self._instances[page_id] = page
+            self._refreshable[page_id] = getattr(page, 'refresh', None)
+            self._page_index[page_id] = self._page_stack.addWidget(page)
+        return page
+    
+    def _preload_next(self):
+        """Tạo trước một page trong queue rồi nhường event loop"""
+        while self._preload_queue:
+            page_id = self._preload_queue.pop(0)
+            if page_id not in self._instances:
+                self._get_page(page_id)
+                break
+        if self._preload_queue:
+            QTimer.singleShot(0, self._preload_next)
+    
+    def _build_action_handlers(self):
+        """Dispatch table cho sidebar actions, build một lần (sau _setup_ui)"""
+        handlers = {
+            "debloater": self._open_debloater,
+            "build_image": partial(self._on_page_changed, "build_image"),
+            "project_created": self._project_sidebar.refresh,
+            "project_deleted": self._project_sidebar.refresh,
+        }
+        for action_id in self._COMING_SOON_ACTIONS:
+            handlers[action_id] = self._show_coming_soon
+        self._action_handlers = handlers
     
     def _connect_signals(self):
         """Connect signals"""
@@ -253,23 +317,40 @@ class MainWindow(QMainWindow):
     
     def _on_page_changed(self, page_id: str):
         """Handle page navigation"""
+        if page_id == self._current_page_id:
+            return  # Đã là page hiện tại: không relayout, không refresh lại
         if page_id in self._pages:
-            page = self._pages[page_id]
-            self._page_stack.setCurrentWidget(page)
+            self._get_page(page_id)
+            self._page_stack.setCurrentIndex(self._page_index[page_id])
+            self._current_page_id = page_id
             
-            # Refresh page
-            if hasattr(page, 'refresh'):
-                page.refresh()
+            # Refresh page (deferred, coalesced)
+            self._request_refresh(page_id)
     
     def _on_project_changed(self, project_name: str):
         """Handle project selection change"""
         self._log.info(f"Đã chọn project: {project_name}")
         
         # Refresh current page
-        current_index = self._page_stack.currentIndex()
-        current_page = self._page_stack.currentWidget()
-        if hasattr(current_page, 'refresh'):
-            current_page.refresh()
+        self._request_refresh(self._current_page_id)
+    
+    def _request_refresh(self, page_id: str):
+        """Đánh dấu page cần refresh; refresh thật chạy ở tick event loop kế tiếp"""
+        self._refresh_pending.add(page_id)
+        self._refresh_timer.start()
+    
+    def _flush_refresh(self):
+        """
+        Refresh một lần cho page đang hiển thị. Page đã bị chuyển qua
+        (click nhanh trên sidebar) bỏ qua - sẽ refresh khi được mở lại.
+        """
+        pending = self._refresh_pending
+        self._refresh_pending = set()
+        page_id = self._current_page_id
+        if page_id in pending:
+            refresh = self._refreshable.get(page_id)
+            if refresh is not None:
+                refresh()
     
     def _on_sidebar_action(self, action_id: str):
         """Handle sidebar context actions"""
@@ -278,20 +359,14 @@ class MainWindow(QMainWindow):
         project = self._ctx.current_project
         
         # Folder actions
-        folder_actions = {
-            "open_rom": lambda p: p.in_dir,
-            "open_build": lambda p: p.out_dir,
-            "open_source": lambda p: p.source_dir,
-            "open_output": lambda p: p.out_dir,
-            "open_config": lambda p: p.config_dir,
-            "open_log": lambda p: p.logs_dir,
-        }
-        
-        if action_id in folder_actions and project:
-            folder = folder_actions[action_id](project)
+        attr = self._FOLDER_ATTRS.get(action_id)
+        if attr and project:
+            folder = getattr(project, attr)
             folder.mkdir(parents=True, exist_ok=True)
-            if os.name == 'nt':
+            if self._os_is_nt:
                 os.startfile(str(folder))
+            else:
+                subprocess.Popen(['xdg-open', str(folder)])
             self._log.info(f"Mở thư mục: {folder}")
             return
         
@@ -300,36 +375,32 @@ class MainWindow(QMainWindow):
             self._on_page_changed(action_id)
             return
         
-        # Debloater dialog (lazy import)
-        if action_id == "debloater":
-            try:
-                from .dialogs.debloater_dialog import DebloaterDialog
-                dialog = DebloaterDialog(self)
-                dialog.exec_()
-            except ImportError as e:
-                QMessageBox.warning(
-                    self, "Missing Dependency",
-                    f"Debloater cần cài đặt 'send2trash'.\n"
-                    f"Chạy: pip install send2trash\n\nLỗi: {e}"
-                )
-                self._log.error(f"[DEBLOATER] Import error: {e}")
-            return
-        
-        # Build actions
-        if action_id == "build_image":
-            self._on_page_changed("build_image")
-            return
-        if action_id in ["build_bulk", "build_super", "make_vbmeta_disabled", "force_encryption", "boot_editor", "patch_boot"]:
-            QMessageBox.information(self, "Info", "Coming soon - Phase 2")
-            return
-        
-        # Other actions
-        if action_id == "project_created":
-            self._project_sidebar.refresh()
-        elif action_id == "project_deleted":
-            self._project_sidebar.refresh()
+        # Dialogs, build actions, project events
+        handler = self._action_handlers.get(action_id)
+        if handler:
+            handler()
+    
+    def _open_debloater(self):
+        """Debloater dialog (lazy import)"""
+        try:
+            from .dialogs.debloater_dialog import DebloaterDialog
+            dialog = DebloaterDialog(self)
+            dialog.exec_()
+        except ImportError as e:
+            QMessageBox.warning(
+                self, "Missing Dependency",
+                f"Debloater cần cài đặt 'send2trash'.\n"
+                f"Chạy: pip install send2trash\n\nLỗi: {e}"
+            )
+            self._log.error(f"[DEBLOATER] Import error: {e}")
+    
+    def _show_coming_soon(self):
+        QMessageBox.information(self, "Info", "Coming soon - Phase 2")
     
     def closeEvent(self, event):
         """Handle window close"""
         self._log.info("Đóng ứng dụng...")
+        # Version cache từ các lookup lazy (có thể ở worker) chỉ được ghi trên GUI thread
+        from ..tools.registry import get_tool_registry
+        get_tool_registry().save_check_cache()
         event.accept()
@@ -3,21 +3,74 @@ AVB/DM-Verity Page - Disable dm-verity + patch fstab
 Phase 2.1: Separate actions for vbmeta-only and fstab-only
 """
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox,
+    QWidget, QGridLayout, QLabel, QPushButton, QGroupBox,
     QListWidget, QListWidgetItem, QMessageBox, QFileDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+import time
+from collections import deque
+from functools import partial
 from pathlib import Path
+from typing import List, Optional, Set
 
 from ...i18n import t
 from ...core.project_store import get_project_store
-from ...core.logbus import get_log_bus
+from ...core.logbus import get_log_bus, LogLevel
 from ...core.state_machine import get_state_machine, TaskType
 from ...core.task_manager import get_task_manager
 from ...core.avb_manager import (
-    scan_vbmeta_targets, find_fstab_files,
     disable_dm_verity_full, disable_avb_only, disable_fstab_only
 )
+from ...core.scan import scan_project_task
+from ..widgets.file_picker import pick_file
+from ..widgets.scan_list import setup_scan_list
+
+
+class _CoalescingLog:
+    """
+    Proxy LogBus cho page: message trùng (cùng level) trong WINDOW giây bị bỏ,
+    số lần bị bỏ được log gộp một dòng ở tick event loop kế tiếp
+    """
+    
+    WINDOW = 0.05
+    
+    __slots__ = ('_log', '_recent', '_suppressed')
+    
+    def __init__(self, log):
+        self._log = log
+        self._recent = deque(maxlen=8)  # ((level, message), monotonic ts)
+        self._suppressed = {}  # (level, message) -> số lần bị bỏ
+    
+    def _emit(self, level: LogLevel, message: str):
+        key = (level, message)
+        now = time.monotonic()
+        if any(k == key and now - ts < self.WINDOW for k, ts in self._recent):
+            if not self._suppressed:
+                QTimer.singleShot(0, self._flush)
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+        self._recent.append((key, now))
+        self._log.log(level, message)
+    
+    def _flush(self):
+        suppressed, self._suppressed = self._suppressed, {}
+        for (level, message), count in suppressed.items():
+            self._log.log(level, f"{message} (lặp lại {count} lần)")
+    
+    def debug(self, message: str):
+        self._emit(LogLevel.DEBUG, message)
+    
+    def info(self, message: str):
+        self._emit(LogLevel.INFO, message)
+    
+    def warning(self, message: str):
+        self._emit(LogLevel.WARNING, message)
+    
+    def error(self, message: str):
+        self._emit(LogLevel.ERROR, message)
+    
+    def success(self, message: str):
+        self._emit(LogLevel.SUCCESS, message)
 
 
 class PageAVB(QWidget):
@@ -26,91 +79,92 @@ class PageAVB(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._projects = get_project_store()
-        self._log = get_log_bus()
+        self._log = _CoalescingLog(get_log_bus())
         self._state = get_state_machine()
         self._tasks = get_task_manager()
+        # Path đang có trong mỗi list -> check trùng O(1) khi Browse
+        self._vbmeta_paths: Set[str] = set()
+        self._fstab_paths: Set[str] = set()
+        self._file_dialog: Optional[QFileDialog] = None  # Lazy, xem pick_file
+        # Scan chạy nền (xem _request_scan): chỉ một scan một lúc
+        self._scan_in_flight = False
+        self._scan_kinds: Set[str] = set()
+        self._scan_project = None
         self._setup_ui()
     
     def _setup_ui(self):
-        layout = QVBoxLayout(self)
+        # Một QGridLayout cho cả page + một grid mỗi group (không lồng V/HBox)
+        layout = QGridLayout(self)
         layout.setContentsMargins(16, 16, 16, 16)
+        layout.setColumnStretch(3, 1)
         
         title = QLabel("AVB / DM-Verity / Forceencrypt")
-        title.setStyleSheet("font-size: 18px; font-weight: bold;")
-        layout.addWidget(title)
+        title.setObjectName("PageTitle")
+        layout.addWidget(title, 0, 0, 1, 4)
         
         desc = QLabel("Disable Android Verified Boot, dm-verity và forceencrypt.")
-        desc.setStyleSheet("color: #888;")
-        layout.addWidget(desc)
+        desc.setObjectName("PageDesc")
+        layout.addWidget(desc, 1, 0, 1, 4)
         
         # vbmeta section
         vbmeta_group = QGroupBox("A) vbmeta Files")
-        vbmeta_layout = QVBoxLayout(vbmeta_group)
+        vbmeta_grid = QGridLayout(vbmeta_group)
+        vbmeta_grid.setColumnStretch(3, 1)
         
         self._vbmeta_list = QListWidget()
         self._vbmeta_list.setMaximumHeight(120)
-        vbmeta_layout.addWidget(self._vbmeta_list)
+        setup_scan_list(self._vbmeta_list)
+        vbmeta_grid.addWidget(self._vbmeta_list, 0, 0, 1, 4)
         
-        vbmeta_btn = QHBoxLayout()
         self._btn_scan_vbmeta = QPushButton("Scan")
         self._btn_scan_vbmeta.clicked.connect(self._scan_vbmeta)
-        vbmeta_btn.addWidget(self._btn_scan_vbmeta)
+        vbmeta_grid.addWidget(self._btn_scan_vbmeta, 1, 0)
         
         self._btn_add_vbmeta = QPushButton("Browse...")
         self._btn_add_vbmeta.clicked.connect(self._browse_vbmeta)
-        vbmeta_btn.addWidget(self._btn_add_vbmeta)
+        vbmeta_grid.addWidget(self._btn_add_vbmeta, 1, 1)
         
         self._btn_clear_vbmeta = QPushButton("Clear")
-        self._btn_clear_vbmeta.clicked.connect(lambda: self._vbmeta_list.clear())
-        vbmeta_btn.addWidget(self._btn_clear_vbmeta)
+        self._btn_clear_vbmeta.clicked.connect(self._clear_vbmeta)
+        vbmeta_grid.addWidget(self._btn_clear_vbmeta, 1, 2)
         
-        vbmeta_btn.addStretch()
-        vbmeta_layout.addLayout(vbmeta_btn)
-        layout.addWidget(vbmeta_group)
+        layout.addWidget(vbmeta_group, 2, 0, 1, 4)
         
         # fstab section
         fstab_group = QGroupBox("B) fstab Files")
-        fstab_layout = QVBoxLayout(fstab_group)
+        fstab_grid = QGridLayout(fstab_group)
+        fstab_grid.setColumnStretch(3, 1)
         
         self._fstab_list = QListWidget()
         self._fstab_list.setMaximumHeight(120)
-        fstab_layout.addWidget(self._fstab_list)
+        setup_scan_list(self._fstab_list)
+        fstab_grid.addWidget(self._fstab_list, 0, 0, 1, 4)
         
-        fstab_btn = QHBoxLayout()
         self._btn_scan_fstab = QPushButton("Scan")
         self._btn_scan_fstab.clicked.connect(self._scan_fstab)
-        fstab_btn.addWidget(self._btn_scan_fstab)
+        fstab_grid.addWidget(self._btn_scan_fstab, 1, 0)
         
         self._btn_add_fstab = QPushButton("Browse...")
         self._btn_add_fstab.clicked.connect(self._browse_fstab)
-        fstab_btn.addWidget(self._btn_add_fstab)
+        fstab_grid.addWidget(self._btn_add_fstab, 1, 1)
         
-        fstab_btn.addStretch()
-        fstab_layout.addLayout(fstab_btn)
-        layout.addWidget(fstab_group)
+        layout.addWidget(fstab_group, 3, 0, 1, 4)
         
         # Actions
-        action_layout = QHBoxLayout()
-        
         self._btn_disable_all = QPushButton("Disable All (A+B)")
         self._btn_disable_all.clicked.connect(self._on_disable_all)
-        self._btn_disable_all.setStyleSheet("background: #c62828; padding: 8px 16px;")
-        action_layout.addWidget(self._btn_disable_all)
+        self._btn_disable_all.setObjectName("AvbDisableAll")
+        layout.addWidget(self._btn_disable_all, 4, 0)
         
         self._btn_vbmeta_only = QPushButton("vbmeta Only (A)")
         self._btn_vbmeta_only.clicked.connect(self._on_vbmeta_only)
-        self._btn_vbmeta_only.setStyleSheet("padding: 8px 16px;")
-        action_layout.addWidget(self._btn_vbmeta_only)
+        layout.addWidget(self._btn_vbmeta_only, 4, 1)
         
         self._btn_fstab_only = QPushButton("fstab Only (B)")
         self._btn_fstab_only.clicked.connect(self._on_fstab_only)
-        self._btn_fstab_only.setStyleSheet("padding: 8px 16px;")
-        action_layout.addWidget(self._btn_fstab_only)
-        
-        action_layout.addStretch()
-        layout.addLayout(action_layout)
+        layout.addWidget(self._btn_fstab_only, 4, 2)
         
-        layout.addStretch()
+        layout.setRowStretch(5, 1)
     
     def _check_project(self) -> bool:
         """Check if project is selected, show warning if not"""
@@ -125,40 +179,82 @@ class PageAVB(QWidget):
         return True
     
     def _scan_vbmeta(self):
+        self._request_scan("vbmeta")
+    
+    def _request_scan(self, *kinds: str):
+        """
+        Chạy scan_project nền rồi fill các list trong kinds ("vbmeta"/"fstab").
+        Đang có scan chạy thì chỉ gom kinds, không submit thêm.
+        """
         if not self._check_project():
             return
+        self._scan_kinds.update(kinds)
+        if self._scan_in_flight:
+            return
+        self._scan_in_flight = True
+        self._scan_project = project = self._projects.current
+        self._tasks.run_background(
+            scan_project_task,
+            on_finished=self._populate_lists,
+            project=project
+        )
+    
+    def _populate_lists(self, result):
+        self._scan_in_flight = False
+        kinds, self._scan_kinds = self._scan_kinds, set()
+        if self._projects.current is not self._scan_project:
+            # Project đổi trong lúc scan -> kết quả cũ, scan lại
+            if self._projects.current:
+                self._request_scan(*kinds)
+            return
+        if not result.ok:
+            self._log.error(f"[AVB] Scan failed: {result.message}")
+            return
         
-        project = self._projects.current
+        if "vbmeta" in kinds:
+            files = result.data["vbmeta"]
+            self._vbmeta_paths = self._fill_list(self._vbmeta_list, files)
+            self._log.info(f"[AVB] Found {len(files)} vbmeta files")
+        if "fstab" in kinds:
+            files = result.data["fstab"]
+            self._fstab_paths = self._fill_list(self._fstab_list, files)
+            self._log.info(f"[AVB] Found {len(files)} fstab files")
+    
+    @staticmethod
+    def _fill_list(lst: QListWidget, files: List[Path]) -> Set[str]:
+        """
+        Thay nội dung list bằng một addItems, tắt repaint/signals trong lúc fill
+        Returns: set các path đã add (cho check trùng)
+        """
+        items = [str(f) for f in files]
+        lst.setUpdatesEnabled(False)
+        lst.blockSignals(True)
+        try:
+            lst.clear()
+            lst.addItems(items)
+        finally:
+            lst.blockSignals(False)
+            lst.setUpdatesEnabled(True)
+        return set(items)
+    
+    def _clear_vbmeta(self):
         self._vbmeta_list.clear()
-        files = scan_vbmeta_targets(project)
-        for f in files:
-            self._vbmeta_list.addItem(str(f))
-        self._log.info(f"[AVB] Found {len(files)} vbmeta files")
+        self._vbmeta_paths.clear()
     
     def _browse_vbmeta(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select vbmeta", "", "Image Files (*.img)")
-        if path:
-            # Check not already in list
-            for i in range(self._vbmeta_list.count()):
-                if self._vbmeta_list.item(i).text() == path:
-                    return
+        path = pick_file(self, "Select vbmeta", "Image Files (*.img)")
+        if path and path not in self._vbmeta_paths:
+            self._vbmeta_paths.add(path)
             self._vbmeta_list.addItem(path)
             self._log.info(f"[AVB] Added vbmeta: {path}")
     
     def _scan_fstab(self):
-        if not self._check_project():
-            return
-        
-        project = self._projects.current
-        self._fstab_list.clear()
-        files = find_fstab_files(project)
-        for f in files:
-            self._fstab_list.addItem(str(f))
-        self._log.info(f"[AVB] Found {len(files)} fstab files")
+        self._request_scan("fstab")
     
     def _browse_fstab(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select fstab", "", "All Files (*)")
-        if path:
+        path = pick_file(self, "Select fstab", "All Files (*)")
+        if path and path not in self._fstab_paths:
+            self._fstab_paths.add(path)
             self._fstab_list.addItem(path)
             self._log.info(f"[AVB] Added fstab: {path}")
     
@@ -186,7 +282,7 @@ class PageAVB(QWidget):
         self._tasks.submit(
             disable_dm_verity_full,
             task_type=TaskType.PATCH,
-            on_finished=lambda r: self._on_task_finished(r, "Disable All"),
+            on_finished=partial(self._on_task_finished, action_name="Disable All"),
             project=project
         )
     
@@ -205,7 +301,7 @@ class PageAVB(QWidget):
         self._tasks.submit(
             disable_avb_only,
             task_type=TaskType.PATCH,
-            on_finished=lambda r: self._on_task_finished(r, "vbmeta Only"),
+            on_finished=partial(self._on_task_finished, action_name="vbmeta Only"),
             project=project
         )
     
@@ -224,15 +320,14 @@ class PageAVB(QWidget):
         self._tasks.submit(
             disable_fstab_only,
             task_type=TaskType.PATCH,
-            on_finished=lambda r: self._on_task_finished(r, "fstab Only"),
+            on_finished=partial(self._on_task_finished, action_name="fstab Only"),
             project=project
         )
     
     def refresh(self):
         """Refresh page when shown"""
         if self._projects.current:
-            self._scan_vbmeta()
-            self._scan_fstab()
+            self._request_scan("vbmeta", "fstab")
     
     def update_translations(self):
         pass
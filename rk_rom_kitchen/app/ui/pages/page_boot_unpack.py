@@ -3,15 +3,20 @@ Boot Unpack/Repack Page
 """
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox,
-    QListWidget, QFileDialog, QMessageBox
+    QListWidget, QListWidgetItem, QFileDialog, QMessageBox
 )
+from PyQt5.QtCore import Qt
 from pathlib import Path
+from typing import Optional, Set
 
 from ...core.project_store import get_project_store
 from ...core.logbus import get_log_bus
 from ...core.state_machine import get_state_machine, TaskType
 from ...core.task_manager import get_task_manager
-from ...core.boot_manager import find_boot_images, unpack_boot_image, repack_boot_image
+from ...core.boot_manager import unpack_boot_image, repack_boot_image
+from ...core.scan import scan_project_task
+from ..widgets.file_picker import pick_file
+from ..widgets.scan_list import setup_scan_list
 
 
 class PageBootUnpack(QWidget):
@@ -23,6 +28,13 @@ class PageBootUnpack(QWidget):
         self._log = get_log_bus()
         self._state = get_state_machine()
         self._tasks = get_task_manager()
+        self._boot_paths: Set[str] = set()  # Item đang có trong list -> check trùng O(1)
+        self._file_dialog: Optional[QFileDialog] = None  # Lazy, xem pick_file
+        # Scan chạy nền (xem _scan_boot): chỉ một scan một lúc,
+        # request trong lúc đang scan -> _scan_pending, chạy lại khi xong
+        self._scan_in_flight = False
+        self._scan_pending = False
+        self._scan_project = None
         self._setup_ui()
     
     def _setup_ui(self):
@@ -30,13 +42,14 @@ class PageBootUnpack(QWidget):
         layout.setContentsMargins(16, 16, 16, 16)
         
         title = QLabel("Unpack/Repack Boot")
-        title.setStyleSheet("font-size: 18px; font-weight: bold;")
+        title.setObjectName("PageTitle")
         layout.addWidget(title)
         
         # Boot images
         boot_group = QGroupBox("Boot Images")
         boot_layout = QVBoxLayout(boot_group)
         self._boot_list = QListWidget()
+        setup_scan_list(self._boot_list)
         boot_layout.addWidget(self._boot_list)
         
         btn_row = QHBoxLayout()
@@ -69,20 +82,52 @@ class PageBootUnpack(QWidget):
         project = self._projects.current
         if not project:
             return
-        self._boot_list.clear()
-        for f in find_boot_images(project):
-            self._boot_list.addItem(str(f))
-        # Also add unpacked folders
-        unpacked_dir = project.out_dir / "boot_unpacked"
-        if unpacked_dir.exists():
-            for d in unpacked_dir.iterdir():
-                if d.is_dir():
-                    self._boot_list.addItem(f"[UNPACKED] {d}")
+        if self._scan_in_flight:
+            self._scan_pending = True  # Filesystem có thể đã đổi sau khi scan đang chạy bắt đầu
+            return
+        self._scan_in_flight = True
+        self._scan_pending = False
+        self._scan_project = project
+        self._tasks.run_background(
+            scan_project_task,
+            on_finished=self._populate_boot_list,
+            project=project
+        )
+    
+    def _populate_boot_list(self, result):
+        self._scan_in_flight = False
+        if self._scan_pending or self._projects.current is not self._scan_project:
+            self._scan_boot()  # Có request mới / project đổi trong lúc scan -> kết quả cũ
+            return
+        if not result.ok:
+            self._log.error(f"[BOOT] Scan failed: {result.message}")
+            return
+        entries = [(str(f), "image", f) for f in result.data["boot"]]
+        entries.extend((f"[UNPACKED] {d}", "unpacked", d) for d in result.data["boot_unpacked"])
+        lst = self._boot_list
+        lst.setUpdatesEnabled(False)
+        lst.blockSignals(True)
+        try:
+            lst.clear()
+            for text, kind, path in entries:
+                lst.addItem(self._make_item(text, kind, path))
+        finally:
+            lst.blockSignals(False)
+            lst.setUpdatesEnabled(True)
+        self._boot_paths = {text for text, _, _ in entries}
+    
+    @staticmethod
+    def _make_item(text: str, kind: str, path: Path) -> QListWidgetItem:
+        """Item list, lưu (kind, path) ở Qt.UserRole - kind: image / unpacked"""
+        item = QListWidgetItem(text)
+        item.setData(Qt.UserRole, (kind, path))
+        return item
     
     def _browse_boot(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select boot image", "", "*.img")
-        if path:
-            self._boot_list.addItem(path)
+        path = pick_file(self, "Select boot image", "*.img")
+        if path and path not in self._boot_paths:
+            self._boot_paths.add(path)
+            self._boot_list.addItem(self._make_item(path, "image", Path(path)))
     
     def _on_unpack(self):
         if not self._state.can_start_task():
@@ -90,18 +135,18 @@ class PageBootUnpack(QWidget):
             return
         
         item = self._boot_list.currentItem()
-        if not item or "[UNPACKED]" in item.text():
+        kind, boot_path = item.data(Qt.UserRole) if item else (None, None)
+        if kind != "image":
             QMessageBox.warning(self, "Warning", "Chon boot image de unpack")
             return
         
         project = self._projects.current
-        boot_path = Path(item.text())
         
         self._log.info(f"Unpacking {boot_path.name}...")
         self._tasks.submit(
             unpack_boot_image,
             task_type=TaskType.EXTRACT,
-            on_finished=lambda r: (self._log.success("Done"), self._scan_boot()) if r.ok else self._log.error(r.message),
+            on_finished=self._on_unpack_finished,
             project=project,
             boot_image=boot_path
         )
@@ -112,22 +157,35 @@ class PageBootUnpack(QWidget):
             return
         
         item = self._boot_list.currentItem()
-        if not item or "[UNPACKED]" not in item.text():
+        kind, unpacked_path = item.data(Qt.UserRole) if item else (None, None)
+        if kind != "unpacked":
             QMessageBox.warning(self, "Warning", "Chon folder da unpack de repack")
             return
         
         project = self._projects.current
-        unpacked_path = Path(item.text().replace("[UNPACKED] ", ""))
         
         self._log.info(f"Repacking {unpacked_path.name}...")
         self._tasks.submit(
             repack_boot_image,
             task_type=TaskType.BUILD,
-            on_finished=lambda r: self._log.success("Done") if r.ok else self._log.error(r.message),
+            on_finished=self._on_repack_finished,
             project=project,
             unpacked_dir=unpacked_path
         )
     
+    def _on_unpack_finished(self, result):
+        if result.ok:
+            self._log.success("Done")
+            self._scan_boot()
+        else:
+            self._log.error(result.message)
+    
+    def _on_repack_finished(self, result):
+        if result.ok:
+            self._log.success("Done")
+        else:
+            self._log.error(result.message)
+    
     def refresh(self):
         self._scan_boot()
     
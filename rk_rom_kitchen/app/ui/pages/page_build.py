@@ -2,10 +2,12 @@
 Build Page - Trang build output ROM
 OUTPUT CONTRACT: out/Image/... (dựa vào result.artifacts)
 """
+import os
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QGroupBox, QMessageBox, QComboBox, QCheckBox
 )
+from PyQt5.QtCore import QTimer, pyqtSlot
 
 from ...i18n import t
 from ...core.project_store import get_project_store
@@ -13,6 +15,44 @@ from ...core.logbus import get_log_bus
 from ...core.state_machine import get_state_machine, TaskType
 from ...core.task_manager import get_task_manager
 from ...core.pipeline import pipeline_build
+from ...core.partition_image_engine import get_partition_list
+from ...core.utils import dir_mtimes
+
+
+def _set_status(lbl: QLabel, status: str):
+    """
+    Màu label theo QSS QLabel[status="ok|off|warn|error"] ("" = mặc định).
+    Chỉ re-polish khi status thực sự đổi, không parse lại stylesheet.
+    """
+    if lbl.property("status") == status:
+        return
+    lbl.setProperty("status", status)
+    style = lbl.style()
+    style.unpolish(lbl)
+    style.polish(lbl)
+
+
+def _count_images(root: str):
+    """
+    Đếm *.img đệ quy (như rglob) bằng os.scandir + stack, không tạo Path mỗi entry.
+    Returns: (count, các thư mục đã đi qua) - mtime các thư mục này làm stamp cache
+    """
+    count = 0
+    dirs = []
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        dirs.append(folder)
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if os.path.normcase(entry.name).endswith(".img"):
+                        count += 1
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            pass
+    return count, tuple(dirs)
 
 
 class PageBuild(QWidget):
@@ -33,6 +73,13 @@ class PageBuild(QWidget):
         # Track artifacts separately to avoid refresh() overwrite
         self._last_artifacts = []
         
+        # ((project path, mtime_ns partition_index.json), partition names)
+        self._partition_cache = (None, [])
+        # (thư mục đã scan, mtime của chúng, số *.img) cho summary out/Image
+        self._out_img_count_cache = ((), (), 0)
+        # Trạng thái lần refresh() cuối, giống hệt -> bỏ qua cập nhật widget
+        self._refresh_sig = None
+        
         self._setup_ui()
     
     def _setup_ui(self):
@@ -145,7 +192,12 @@ class PageBuild(QWidget):
         # Stretch
         layout.addStretch()
         
-        # Connect state changes
+        # Connect state changes - gom các lần đổi state trong một tick thành một lần
+        self._pending_state = ""
+        self._state_timer = QTimer(self)
+        self._state_timer.setSingleShot(True)
+        self._state_timer.setInterval(0)
+        self._state_timer.timeout.connect(self._apply_state)
         try:
             self._state.state_changed.connect(self._on_state_changed)
         except AttributeError:
@@ -154,17 +206,29 @@ class PageBuild(QWidget):
         self.refresh()
     
     def _get_partition_list(self):
-        """Get list of partitions from extract/partition_index.json"""
+        """
+        Get list of partitions from extract/partition_index.json
+        Chỉ đọc lại JSON khi mtime file index đổi (hoặc sau build thành công)
+        """
         project = self._projects.current
         if not project:
             return []
         
         try:
-            from ...core.partition_image_engine import get_partition_list
+            mtime = os.stat(project.extract_dir / "partition_index.json").st_mtime_ns
+        except OSError:
+            return []
+        key = (str(project.path), mtime)
+        if self._partition_cache[0] == key:
+            return self._partition_cache[1]
+        
+        try:
             partitions = get_partition_list(project)
-            return [p.get("partition_name", "") for p in partitions if p.get("partition_name")]
+            names = [p.get("partition_name", "") for p in partitions if p.get("partition_name")]
         except Exception:
             return []
+        self._partition_cache = (key, names)
+        return names
     
     def _update_partition_repack_state(self):
         """Enable/disable Partition Repack group based on input_type"""
@@ -187,6 +251,7 @@ class PageBuild(QWidget):
                 "Với update.img/super.img, hãy dùng Extract/Build theo pipeline."
             )
     
+    @pyqtSlot()
     def _on_repack_one(self):
         """Repack selected partition"""
         if not self._state.can_start_task():
@@ -217,6 +282,7 @@ class PageBuild(QWidget):
             selected_partition=partition_name
         )
     
+    @pyqtSlot()
     def _on_repack_all(self):
         """Repack all partitions"""
         if not self._state.can_start_task():
@@ -246,6 +312,7 @@ class PageBuild(QWidget):
             project=project
         )
     
+    @pyqtSlot()
     def _on_build(self):
         """Handle build button"""
         if not self._state.can_start_task():
@@ -274,14 +341,19 @@ class PageBuild(QWidget):
     def _clear_artifacts(self):
         """Clear artifacts display before build"""
         self._last_artifacts = []
+        self._refresh_sig = None  # Summary bị ghi đè -> refresh sau phải vẽ lại
         self._lbl_output_artifacts.setText("")
         self._lbl_output_summary.setText("Đang build...")
-        self._lbl_output_summary.setStyleSheet("color: #969696;")
+        _set_status(self._lbl_output_summary, "off")
     
+    @pyqtSlot(object)
     def _on_build_finished(self, result):
         """Handle build completion - show artifacts from result, NOT overwritten by refresh"""
         if result.ok:
             self._log.success(f"Build thành công trong {result.elapsed_ms}ms")
+            self._partition_cache = (None, [])
+            self._out_img_count_cache = ((), (), 0)
+            self._refresh_sig = None
             
             if result.artifacts:
                 # Store artifacts to prevent refresh overwrite
@@ -292,11 +364,11 @@ class PageBuild(QWidget):
                 if len(result.artifacts) > 5:
                     artifacts_text += f"\n... và {len(result.artifacts) - 5} files khác"
                 self._lbl_output_artifacts.setText(artifacts_text)
-                self._lbl_output_artifacts.setStyleSheet("color: #4ec9b0;")
+                _set_status(self._lbl_output_artifacts, "ok")
                 
                 # Summary
                 self._lbl_output_summary.setText(f"✓ Hoàn tất: {len(result.artifacts)} files")
-                self._lbl_output_summary.setStyleSheet("color: #4ec9b0;")
+                _set_status(self._lbl_output_summary, "ok")
             else:
                 # WARNING: OK but no artifacts
                 self._lbl_output_artifacts.setText("")
@@ -304,16 +376,17 @@ class PageBuild(QWidget):
                     "⚠️ Hoàn tất nhưng không nhận được artifacts. "
                     "Vui lòng mở logs/ để kiểm tra."
                 )
-                self._lbl_output_summary.setStyleSheet("color: #ffa500;")  # Orange warning
+                _set_status(self._lbl_output_summary, "warn")  # Orange warning
             
             self.refresh()
         else:
             self._log.error(f"Build thất bại: {result.message}")
             self._lbl_output_artifacts.setText("")
             self._lbl_output_summary.setText(f"✗ {result.message}")
-            self._lbl_output_summary.setStyleSheet("color: #f14c4c;")
+            _set_status(self._lbl_output_summary, "error")
             QMessageBox.critical(self, t("dialog_error"), result.message)
     
+    @pyqtSlot()
     def _on_open_output(self):
         """Open out/Image folder"""
         import os
@@ -333,9 +406,16 @@ class PageBuild(QWidget):
         
         self._log.info(f"Mở thư mục: {output_dir}")
     
+    @pyqtSlot(str)
     def _on_state_changed(self, state: str):
+        """Ghi nhận state mới; UI cập nhật một lần ở tick event loop kế tiếp"""
+        self._pending_state = state
+        self._state_timer.start()
+    
+    @pyqtSlot()
+    def _apply_state(self):
         """Update UI based on state"""
-        is_busy = state == "running"
+        is_busy = self._pending_state == "running"
         self._btn_build.setEnabled(not is_busy)
         self._btn_repack_one.setEnabled(not is_busy and self._partition_group.isEnabled())
         self._btn_repack_all.setEnabled(not is_busy and self._partition_group.isEnabled())
@@ -345,6 +425,15 @@ class PageBuild(QWidget):
         project = self._projects.current
         if project:
             config = project.config
+            partitions = self._get_partition_list()
+            image_count = 0 if self._last_artifacts else self._count_output_images(project)
+            sig = (
+                str(project.path), config.imported, config.extracted, config.patched,
+                config.built, getattr(config, 'input_type', ''), tuple(partitions),
+                bool(self._last_artifacts), image_count,
+            )
+            if sig == self._refresh_sig:
+                return
             
             self._lbl_imported.setText(f"Imported: {'✓' if config.imported else '✗'}")
             self._lbl_extracted.setText(f"Extracted: {'✓' if config.extracted else '✗'}")
@@ -358,28 +447,28 @@ class PageBuild(QWidget):
                 (self._lbl_patched, config.patched),
                 (self._lbl_built, config.built),
             ]:
-                color = "#4ec9b0" if flag else "#969696"
-                lbl.setStyleSheet(f"color: {color};")
+                _set_status(lbl, "ok" if flag else "off")
             
             # Update partition repack state based on input_type
             self._update_partition_repack_state()
             
             # Populate partition dropdown
             self._combo_partition.clear()
-            partitions = self._get_partition_list()
             if partitions:
                 self._combo_partition.addItems(partitions)
             
             # Update summary ONLY if no artifacts stored
             if not self._last_artifacts:
-                output_imgs = list(project.out_image_dir.rglob("*.img"))
-                if output_imgs:
-                    self._lbl_output_summary.setText(f"{len(output_imgs)} images trong out/Image/")
-                    self._lbl_output_summary.setStyleSheet("color: #969696;")
+                if image_count:
+                    self._lbl_output_summary.setText(f"{image_count} images trong out/Image/")
+                    _set_status(self._lbl_output_summary, "off")
                 else:
                     self._lbl_output_summary.setText("—")
-                    self._lbl_output_summary.setStyleSheet("")
+                    _set_status(self._lbl_output_summary, "")
+            
+            self._refresh_sig = sig
         else:
+            self._refresh_sig = None
             self._lbl_imported.setText("Imported: —")
             self._lbl_extracted.setText("Extracted: —")
             self._lbl_patched.setText("Patched: —")
@@ -389,6 +478,16 @@ class PageBuild(QWidget):
             self._combo_partition.clear()
             self._partition_group.setEnabled(False)
     
+    def _count_output_images(self, project) -> int:
+        """Số *.img trong out/Image, chỉ walk lại khi có thư mục con đổi mtime"""
+        root = str(project.out_image_dir)
+        dirs, mtimes, count = self._out_img_count_cache
+        if dirs[:1] == (root,) and dir_mtimes(dirs) == mtimes:
+            return count
+        count, dirs = _count_images(root)
+        self._out_img_count_cache = (dirs, dir_mtimes(dirs), count)
+        return count
+    
     def update_translations(self):
         """Update UI khi đổi ngôn ngữ"""
         self._btn_build.setText(t("btn_build"))
@@ -8,7 +8,7 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox,
     QComboBox, QLineEdit, QCheckBox, QSpinBox, QMessageBox, QTextEdit, QSplitter
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSlot
 
 from ...i18n import t
 from ...core.project_store import get_project_store
@@ -37,6 +37,8 @@ class BuildImagePage(QWidget):
         
         # Store widget references for binding
         self._widgets = {}
+        # Partition đang chọn, cập nhật từ currentTextChanged
+        self._current_partition = self.PARTITIONS[0]
         self._setup_ui()
     
     def _setup_ui(self):
@@ -46,7 +48,7 @@ class BuildImagePage(QWidget):
         # Header
         header = QHBoxLayout()
         title = QLabel("Build Image")
-        title.setStyleSheet("font-size: 18px; font-weight: bold;")
+        title.setObjectName("PageTitle")
         header.addWidget(title)
         header.addStretch()
         layout.addLayout(header)
@@ -223,8 +225,10 @@ class BuildImagePage(QWidget):
         
         return config
     
+    @pyqtSlot(str)
     def _on_partition_changed(self, partition: str):
         """Load config for partition - creates NEW config instance"""
+        self._current_partition = partition
         project = self._projects.current
         if not project:
             self._log.warning("[BUILD_IMAGE] No project selected")
@@ -271,6 +275,7 @@ class BuildImagePage(QWidget):
         # Load config values into UI
         self._load_config_to_ui(config)
     
+    @pyqtSlot()
     def _on_build(self):
         """Build button clicked - validate and submit task"""
         if not self._state.can_start_task():
@@ -285,7 +290,7 @@ class BuildImagePage(QWidget):
         
         # Read config from UI
         config = self._read_config_from_ui()
-        partition = self._partition_combo.currentText()
+        partition = self._current_partition
         
         # Validate source dir
         source_path = Path(config.source_dir)
@@ -314,6 +319,7 @@ class BuildImagePage(QWidget):
             config=config
         )
     
+    @pyqtSlot(object)
     def _on_build_finished(self, result):
         if result.ok:
             self._log.success(f"[BUILD_IMAGE] Completed: {result.message}")
@@ -324,7 +330,7 @@ class BuildImagePage(QWidget):
     
     def refresh(self):
         """Refresh page when shown"""
-        self._on_partition_changed(self._partition_combo.currentText())
+        self._on_partition_changed(self._current_partition)
     
     def update_translations(self):
         pass
@@ -34,7 +34,7 @@ class PageMagisk(QWidget):
         layout.setContentsMargins(16, 16, 16, 16)
         
         title = QLabel("Magisk Patch")
-        title.setStyleSheet("font-size: 18px; font-weight: bold;")
+        title.setObjectName("PageTitle")
         layout.addWidget(title)
         
         # Boot images list
@@ -147,7 +147,7 @@ class PageMagisk(QWidget):
         self._tasks.submit(
             patch_boot_with_magisk,
             task_type=TaskType.PATCH,
-            on_finished=lambda r: self._log.success("Done") if r.ok else self._log.error(r.message),
+            on_finished=self._on_patch_finished,
             project=project,
             boot_image=boot_path,
             magisk_apk=self._magisk_apk,
@@ -158,6 +158,12 @@ class PageMagisk(QWidget):
             arch=self._arch_combo.currentText()
         )
     
+    def _on_patch_finished(self, result):
+        if result.ok:
+            self._log.success("Done")
+        else:
+            self._log.error(result.message)
+    
     def refresh(self):
         self._scan_boot()
     
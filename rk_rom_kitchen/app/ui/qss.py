@@ -380,6 +380,38 @@ QWidget#LogPanel {{
     border-top: 1px solid {COLORS['border']};
 }}
 
+/* Page header (title + mô tả) */
+QLabel#PageTitle {{
+    font-size: 18px;
+    font-weight: bold;
+}}
+
+QLabel#PageDesc {{
+    color: #888;
+}}
+
+/* AVB page: nút Disable All */
+QPushButton#AvbDisableAll, QPushButton#AvbDisableAll:hover {{
+    background-color: #c62828;
+}}
+
+/* Status label: lbl.setProperty("status", ...) thay cho setStyleSheet mỗi lần refresh */
+QLabel[status="ok"] {{
+    color: {COLORS['success']};
+}}
+
+QLabel[status="off"] {{
+    color: {COLORS['fg_secondary']};
+}}
+
+QLabel[status="warn"] {{
+    color: #ffa500;
+}}
+
+QLabel[status="error"] {{
+    color: {COLORS['error']};
+}}
+
 /* Info Box */
 QFrame#InfoBox {{
     background-color: {COLORS['bg_light']};
@@ -2,6 +2,7 @@
 File Picker - Widget để chọn file ROM
 """
 from pathlib import Path
+from typing import Optional
 from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QLineEdit, QPushButton, QFileDialog
 )
@@ -10,6 +11,25 @@ from PyQt5.QtCore import pyqtSignal
 from ...i18n import t
 
 
+def pick_file(owner: QWidget, caption: str, name_filter: str,
+              attr: str = "_file_dialog") -> str:
+    """
+    Chọn một file bằng QFileDialog dùng chung của owner, giữ ở owner.<attr>
+    (tạo ở lần đầu, non-native để reuse được). Returns: path hoặc "" nếu cancel
+    """
+    dlg: Optional[QFileDialog] = getattr(owner, attr, None)
+    if dlg is None:
+        dlg = QFileDialog(owner)
+        dlg.setOption(QFileDialog.DontUseNativeDialog, True)
+        dlg.setFileMode(QFileDialog.ExistingFile)
+        setattr(owner, attr, dlg)
+    dlg.setWindowTitle(caption)
+    dlg.setNameFilter(name_filter)
+    if dlg.exec_() and dlg.selectedFiles():
+        return dlg.selectedFiles()[0]
+    return ""
+
+
 class FilePicker(QWidget):
     """
     File picker với text field và browse button
@@ -8,7 +8,7 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit,
     QLineEdit, QPushButton, QCheckBox, QLabel
 )
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, QTimer, pyqtSlot
 from PyQt5.QtGui import QTextCursor, QColor, QTextCharFormat
 
 from ...i18n import t
@@ -41,6 +41,7 @@ class LogPanel(QWidget):
         self._log_bus = get_log_bus()
         self._auto_scroll = True
         self._all_entries: list[LogEntry] = []
+        self._burst = False  # Đang gom append, repaint ở tick event loop kế tiếp
         
         self._setup_ui()
         self._connect_signals()
@@ -125,6 +126,7 @@ class LogPanel(QWidget):
     
     def _append_entry(self, entry: LogEntry):
         """Append entry to text widget với color"""
+        self._begin_burst()
         cursor = self._log_text.textCursor()
         cursor.movePosition(QTextCursor.End)
         
@@ -134,14 +136,25 @@ class LogPanel(QWidget):
         fmt.setForeground(QColor(color))
         
         cursor.insertText(entry.formatted() + "\n", fmt)
-        
-        # Auto-scroll
+    
+    def _begin_burst(self):
+        """Tắt repaint khi bắt đầu một loạt append, bật lại lúc event loop idle"""
+        if not self._burst:
+            self._burst = True
+            self._log_text.setUpdatesEnabled(False)
+            QTimer.singleShot(0, self._end_burst)
+    
+    def _end_burst(self):
+        """Repaint một lần cho cả loạt append; auto-scroll cũng chỉ một lần"""
+        self._burst = False
+        self._log_text.setUpdatesEnabled(True)
         if self._auto_scroll:
-            self._log_text.setTextCursor(cursor)
+            self._log_text.moveCursor(QTextCursor.End)
             self._log_text.ensureCursorVisible()
     
     def _on_filter_changed(self, text: str):
         """Re-filter logs"""
+        self._begin_burst()
         self._log_text.clear()
         filter_text = text.lower()
         
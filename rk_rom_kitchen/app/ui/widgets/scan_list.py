@@ -0,0 +1,15 @@
+"""
+Scan List - Cấu hình chung cho QListWidget hiển thị kết quả scan (vbmeta/fstab/boot)
+"""
+from PyQt5.QtWidgets import QListWidget, QListView
+from PyQt5.QtCore import Qt
+
+
+def setup_scan_list(lst: QListWidget):
+    """Item một dòng cùng chiều cao -> layout O(1) mỗi item, batch khi nhiều file"""
+    lst.setUniformItemSizes(True)
+    lst.setLayoutMode(QListView.Batched)
+    lst.setBatchSize(256)
+    lst.setAutoScroll(False)
+    lst.setVerticalScrollMode(QListView.ScrollPerPixel)
+    lst.viewport().setAttribute(Qt.WA_StaticContents, True)